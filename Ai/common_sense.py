@@ -1,11 +1,35 @@
 import re
 import json
+from collections import deque
+from functools import lru_cache
 from datetime import datetime, time
 
+# Practical advice appended when the query mentions a trigger word
+_PRACTICAL_ADVICE = {
+    "rain": " By the way, if it's raining, don't forget an umbrella!",
+    "cold": " In cold weather, make sure to dress warmly.",
+    "hot": " In hot weather, stay hydrated and seek shade.",
+    "driving": " Remember to always drive safely and follow traffic rules.",
+    "health": " If you're experiencing health issues, it's best to consult with a healthcare professional.",
+    "schedule": " Good time management can help reduce stress and improve productivity."
+}
+_PRACTICAL_TRIGGERS = {
+    "rain": ("rain",),
+    "cold": ("cold",),
+    "hot": ("hot",),
+    "driving": ("drive", "driving", "car"),
+    "health": ("sick", "illness", "pain", "hurt"),
+    "schedule": ("busy", "time", "schedule")
+}
+
+_HARMFUL_KEYWORDS = ("dangerous", "illegal", "harmful", "unsafe")
+
 class CommonSense:
     def __init__(self):
         self.knowledge_base = self.load_common_sense_rules()
-        self.context_memory = []
+        self.context_memory = deque(maxlen=5)  # Last 5 responses
+        # Enhancement is pure in (query, response, hour, month), so repeated turns hit the cache
+        self.enhance_cached = lru_cache(maxsize=512)(self.enhance_uncached)
     
     def load_common_sense_rules(self):
         """Load basic common sense knowledge"""
@@ -52,23 +76,28 @@ class CommonSense:
             }
         }
     
-    def apply_common_sense(self, query, ai_response):
+    def apply_common_sense(self, query, ai_response, query_lower=None):
         """Apply common sense reasoning to AI responses"""
+        query_lower = query_lower or query.lower()
+        response_lower = ai_response.lower()
+        
         # Check if response needs common sense correction
-        corrected_response = self.check_logical_consistency(query, ai_response)
+        corrected_response = self.check_logical_consistency(query, ai_response, query_lower, response_lower)
         
         # Add practical context
-        enhanced_response = self.add_practical_context(query, corrected_response)
+        enhanced_response = self.add_practical_context(query, corrected_response, query_lower)
         
-        # Apply safety and ethics
-        safe_response = self.apply_safety_filter(enhanced_response)
+        # Apply safety and ethics (reuse the lowered text if nothing was rewritten)
+        if enhanced_response is not ai_response:
+            response_lower = None
+        safe_response = self.apply_safety_filter(enhanced_response, response_lower)
         
         return safe_response
     
-    def check_logical_consistency(self, query, response):
+    def check_logical_consistency(self, query, response, query_lower=None, response_lower=None):
         """Check if response makes logical sense"""
-        query_lower = query.lower()
-        response_lower = response.lower()
+        query_lower = query_lower or query.lower()
+        response_lower = response_lower or response.lower()
         
         # Time-based logic
         if "yesterday" in query_lower and "tomorrow" in response_lower:
@@ -82,50 +111,40 @@ class CommonSense:
         ]
         
         if any(impossible_phrases):
-            return "That doesn't seem physically possible. Let me give you a more realistic answer: " + self.get_realistic_alternative(query)
+            return "That doesn't seem physically possible. Let me give you a more realistic answer: " + self.get_realistic_alternative(query, query_lower)
         
         return response
     
-    def add_practical_context(self, query, response):
+    def add_practical_context(self, query, response, query_lower=None):
         """Add practical, real-world context"""
-        query_lower = query.lower()
-        
-        # Weather-related advice
-        if any(word in query_lower for word in ["rain", "cold", "hot", "snow"]):
-            if "rain" in query_lower:
-                response += " By the way, if it's raining, don't forget an umbrella!"
-            elif "cold" in query_lower:
-                response += " In cold weather, make sure to dress warmly."
-            elif "hot" in query_lower:
-                response += " In hot weather, stay hydrated and seek shade."
+        query_lower = query_lower or query.lower()
         
-        # Safety reminders
-        if any(word in query_lower for word in ["drive", "driving", "car"]):
-            response += " Remember to always drive safely and follow traffic rules."
+        # Weather-related advice (only the first matching kind)
+        for weather in ("rain", "cold", "hot"):
+            if any(word in query_lower for word in _PRACTICAL_TRIGGERS[weather]):
+                response += _PRACTICAL_ADVICE[weather]
+                break
         
-        # Health advice
-        if any(word in query_lower for word in ["sick", "illness", "pain", "hurt"]):
-            response += " If you're experiencing health issues, it's best to consult with a healthcare professional."
-        
-        # Time management
-        if any(word in query_lower for word in ["busy", "time", "schedule"]):
-            response += " Good time management can help reduce stress and improve productivity."
+        # Safety reminders, health advice and time management
+        for category in ("driving", "health", "schedule"):
+            if any(word in query_lower for word in _PRACTICAL_TRIGGERS[category]):
+                response += _PRACTICAL_ADVICE[category]
         
         return response
     
-    def apply_safety_filter(self, response):
+    def apply_safety_filter(self, response, response_lower=None):
         """Apply safety and ethical guidelines"""
         # Remove potentially harmful advice
-        harmful_keywords = ["dangerous", "illegal", "harmful", "unsafe"]
+        response_lower = response_lower or response.lower()
         
-        if any(keyword in response.lower() for keyword in harmful_keywords):
+        if any(keyword in response_lower for keyword in _HARMFUL_KEYWORDS):
             return "I want to make sure I give you safe and helpful advice. " + response + " Please prioritize your safety and follow local laws and guidelines."
         
         return response
     
-    def get_realistic_alternative(self, query):
+    def get_realistic_alternative(self, query, query_lower=None):
         """Provide realistic alternatives to impossible scenarios"""
-        query_lower = query.lower()
+        query_lower = query_lower or query.lower()
         
         if "fly" in query_lower and "human" in query_lower:
             return "Humans can't fly naturally, but we can use airplanes, helicopters, or other aircraft to travel through the air."
@@ -135,45 +154,52 @@ class CommonSense:
         
         return "Let me provide a more realistic perspective on that."
     
-    def add_contextual_awareness(self, query, response):
+    def add_contextual_awareness(self, query, response, now=None):
         """Add awareness of current context and situation"""
-        current_hour = datetime.now().hour
+        now = now or datetime.now()
+        return self.add_time_awareness(query, response, now.hour, now.month)
+    
+    def add_time_awareness(self, query, response, current_hour, current_month, query_lower=None):
+        """Add time of day and seasonal notes for the given hour and month"""
+        query_lower = query_lower or query.lower()
         
         # Time-appropriate responses
-        if "good morning" in query.lower() and current_hour > 12:
+        if "good morning" in query_lower and current_hour > 12:
             response = "Actually, it's afternoon now, but good day to you too! " + response
-        elif "good evening" in query.lower() and current_hour < 17:
+        elif "good evening" in query_lower and current_hour < 17:
             response = "It's still daytime, but good day! " + response
         
         # Seasonal awareness
-        current_month = datetime.now().month
-        if current_month in [12, 1, 2] and "summer" in query.lower():
+        if current_month in [12, 1, 2] and "summer" in query_lower:
             response = "Just to note, it's currently winter season. " + response
-        elif current_month in [6, 7, 8] and "winter" in query.lower():
+        elif current_month in [6, 7, 8] and "winter" in query_lower:
             response = "Just to note, it's currently summer season. " + response
         
         return response
     
-    def check_contradictions(self, new_response):
+    def check_contradictions(self, new_response, now=None):
         """Check for contradictions with previous statements"""
-        # Store context for contradiction checking
+        # Store context for contradiction checking (oldest drops off past 5)
         self.context_memory.append({
             'response': new_response,
-            'timestamp': datetime.now()
+            'timestamp': now or datetime.now()
         })
         
-        # Keep only recent context (last 5 responses)
-        if len(self.context_memory) > 5:
-            self.context_memory = self.context_memory[-5:]
-        
         return new_response
     
+    def enhance_uncached(self, query, ai_response, current_hour, current_month):
+        """Apply the stateless common sense enhancements"""
+        # Lowercase the query once for every step
+        query_lower = query.lower()
+        enhanced = self.apply_common_sense(query, ai_response, query_lower)
+        return self.add_time_awareness(query, enhanced, current_hour, current_month, query_lower)
+    
     def enhance_with_common_sense(self, query, ai_response):
         """Main method to enhance AI response with common sense"""
         # Apply all common sense enhancements
-        enhanced = self.apply_common_sense(query, ai_response)
-        enhanced = self.add_contextual_awareness(query, enhanced)
-        enhanced = self.check_contradictions(enhanced)
+        now = datetime.now()
+        enhanced = self.enhance_cached(query, ai_response, now.hour, now.month)
+        enhanced = self.check_contradictions(enhanced, now)
         
         return enhanced
 
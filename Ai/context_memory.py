@@ -1,76 +1,151 @@
 import json
 import os
+import atexit
+import heapq
+from collections import Counter, deque
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard json module
+    orjson = None
+
+# Simple topic extraction based on keywords
+_TOPICS = {
+    "technology": ["computer", "software", "ai", "robot", "internet", "phone"],
+    "science": ["physics", "chemistry", "biology", "space", "research"],
+    "entertainment": ["movie", "music", "game", "book", "tv", "show"],
+    "food": ["eat", "food", "cook", "recipe", "restaurant", "meal"],
+    "travel": ["travel", "trip", "vacation", "country", "city", "visit"],
+    "work": ["job", "work", "career", "office", "business", "company"],
+    "health": ["health", "exercise", "doctor", "medicine", "fitness"],
+    "education": ["school", "study", "learn", "university", "course"]
+}
+
+# Keyword groups used to score conversation importance
+_PERSONAL_PHRASES = ("my name", "i am", "i live", "my age", "my job")
+_EMOTION_WORDS = ("love", "hate", "sad", "happy", "angry", "excited")
+_REQUEST_WORDS = ("help", "please", "can you", "need")
+
 class ContextMemory:
     def __init__(self):
         self.memory_file = "context_memory.json"
-        self.session_memory = []
+        self.log_file = "context_memory.jsonl"  # Append-only log of new conversations
+        self.session_memory = deque(maxlen=20)  # Last 20 exchanges
+        self.session_hour = None  # (year, month, day, hour) of the cached session id
+        self.session_id = None
         self.long_term_memory = {}
+        self.compact_interval = 50  # Rewrite the full memory file every N logged conversations
+        self.logged_changes = 0
         self.load_memory()
+        self.log_handle = open(self.log_file, 'a', encoding='utf-8')
+        atexit.register(self.flush_memory)
     
     def load_memory(self):
         """Load long-term memory from file"""
         try:
             with open(self.memory_file, 'r') as f:
                 self.long_term_memory = json.load(f)
-        except:
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Error loading memory: {e}")
             self.long_term_memory = {
                 "conversations": [],
                 "user_info": {},
                 "topics": {},
                 "relationships": {}
             }
+        self.long_term_memory["topics"] = Counter(self.long_term_memory.get("topics", {}))
+        
+        # Replay conversations logged since the last compaction
+        try:
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        self.apply_memory_item(json.loads(line))
+                        self.logged_changes += 1
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error replaying memory log: {e}")
     
     def save_memory(self):
-        """Save memory to file"""
+        """Save memory to file and reset the append-only log"""
         try:
-            with open(self.memory_file, 'w') as f:
-                json.dump(self.long_term_memory, f, indent=2)
+            if orjson:
+                payload = orjson.dumps(self.long_term_memory, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(self.long_term_memory, indent=2).encode('utf-8')
+            
+            # Replace the snapshot atomically; the log is only cleared once the new file is in place
+            temp_path = self.memory_file + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.memory_file)
+            self.log_handle.seek(0)
+            self.log_handle.truncate()
+            self.logged_changes = 0
         except Exception as e:
             print(f"Error saving memory: {e}")
     
-    def add_to_session_memory(self, user_input, ai_response):
+    def flush_memory(self):
+        """Compact the log into the memory file if anything was logged"""
+        if self.logged_changes:
+            self.save_memory()
+    
+    def add_to_session_memory(self, user_input, ai_response, now=None):
         """Add conversation to current session memory"""
+        now = now or datetime.now()
         memory_item = {
             "user_input": user_input,
             "ai_response": ai_response,
-            "timestamp": datetime.now().isoformat(),
-            "session_id": self.get_current_session_id()
+            "timestamp": now.isoformat(),
+            "session_id": self.get_current_session_id(now)
         }
         
+        # Session memory is bounded, so the oldest exchange drops off automatically
         self.session_memory.append(memory_item)
-        
-        # Keep session memory manageable (last 20 exchanges)
-        if len(self.session_memory) > 20:
-            self.session_memory = self.session_memory[-20:]
     
-    def add_to_long_term_memory(self, user_input, ai_response):
+    def add_to_long_term_memory(self, user_input, ai_response, now=None):
         """Add important conversations to long-term memory"""
+        now = now or datetime.now()
         memory_item = {
             "user_input": user_input,
             "ai_response": ai_response,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "importance": self.calculate_importance(user_input)
         }
         
+        # Append to the log instead of rewriting the whole memory file
+        try:
+            self.log_handle.write(json.dumps(memory_item) + "\n")
+            self.log_handle.flush()
+        except Exception as e:
+            print(f"Error logging memory: {e}")
+        
+        self.apply_memory_item(memory_item)
+        
+        self.logged_changes += 1
+        if self.logged_changes >= self.compact_interval:
+            self.save_memory()
+    
+    def apply_memory_item(self, memory_item):
+        """Apply a long-term memory item to the in-memory state"""
         self.long_term_memory["conversations"].append(memory_item)
         
         # Extract and store important information
-        self.extract_user_info(user_input)
-        self.extract_topics(user_input)
+        self.extract_user_info(memory_item["user_input"])
+        self.extract_topics(memory_item["user_input"])
         
-        # Keep only important memories (last 100)
-        if len(self.long_term_memory["conversations"]) > 100:
-            # Sort by importance and keep top 100
-            sorted_memories = sorted(
+        # Keep only important memories (top 100), trimming in batches
+        if len(self.long_term_memory["conversations"]) > 120:
+            self.long_term_memory["conversations"] = heapq.nlargest(
+                100,
                 self.long_term_memory["conversations"],
-                key=lambda x: x.get("importance", 0),
-                reverse=True
+                key=lambda x: x.get("importance", 0)
             )
-            self.long_term_memory["conversations"] = sorted_memories[:100]
-        
-        self.save_memory()
     
     def calculate_importance(self, user_input):
         """Calculate importance score of conversation"""
@@ -78,7 +153,7 @@ class ContextMemory:
         text = user_input.lower()
         
         # Personal information is important
-        if any(phrase in text for phrase in ["my name", "i am", "i live", "my age", "my job"]):
+        if any(phrase in text for phrase in _PERSONAL_PHRASES):
             importance += 5
         
         # Questions are moderately important
@@ -86,11 +161,11 @@ class ContextMemory:
             importance += 2
         
         # Emotional content is important
-        if any(word in text for word in ["love", "hate", "sad", "happy", "angry", "excited"]):
+        if any(word in text for word in _EMOTION_WORDS):
             importance += 3
         
         # Requests for help are important
-        if any(word in text for word in ["help", "please", "can you", "need"]):
+        if any(word in text for word in _REQUEST_WORDS):
             importance += 2
         
         # Length indicates complexity/importance
@@ -102,52 +177,37 @@ class ContextMemory:
     def extract_user_info(self, user_input):
         """Extract and store user information"""
         text = user_input.lower()
+        user_info = self.long_term_memory["user_info"]
         
         # Extract name
         if "my name is" in text:
             name = text.split("my name is")[-1].strip().split()[0]
-            self.long_term_memory["user_info"]["name"] = name
+            user_info["name"] = name
         
         # Extract location
         if "i live in" in text or "i am from" in text:
             location = text.split("in" if "in" in text else "from")[-1].strip()
-            self.long_term_memory["user_info"]["location"] = location
+            user_info["location"] = location
         
         # Extract age
         if "i am" in text and "years old" in text:
             try:
                 age = int([word for word in text.split() if word.isdigit()][0])
-                self.long_term_memory["user_info"]["age"] = age
+                user_info["age"] = age
             except:
                 pass
         
         # Extract interests
         if "i like" in text or "i love" in text:
             interest = text.split("like" if "like" in text else "love")[-1].strip()
-            if "interests" not in self.long_term_memory["user_info"]:
-                self.long_term_memory["user_info"]["interests"] = []
-            self.long_term_memory["user_info"]["interests"].append(interest)
+            user_info.setdefault("interests", []).append(interest)
     
     def extract_topics(self, user_input):
         """Extract and track conversation topics"""
-        # Simple topic extraction based on keywords
-        topics = {
-            "technology": ["computer", "software", "ai", "robot", "internet", "phone"],
-            "science": ["physics", "chemistry", "biology", "space", "research"],
-            "entertainment": ["movie", "music", "game", "book", "tv", "show"],
-            "food": ["eat", "food", "cook", "recipe", "restaurant", "meal"],
-            "travel": ["travel", "trip", "vacation", "country", "city", "visit"],
-            "work": ["job", "work", "career", "office", "business", "company"],
-            "health": ["health", "exercise", "doctor", "medicine", "fitness"],
-            "education": ["school", "study", "learn", "university", "course"]
-        }
-        
         text = user_input.lower()
-        for topic, keywords in topics.items():
-            if any(keyword in text for keyword in keywords):
-                if topic not in self.long_term_memory["topics"]:
-                    self.long_term_memory["topics"][topic] = 0
-                self.long_term_memory["topics"][topic] += 1
+        self.long_term_memory["topics"].update(
+            topic for topic, keywords in _TOPICS.items() if any(keyword in text for keyword in keywords)
+        )
     
     def get_relevant_context(self, current_input):
         """Get relevant context for current conversation"""
@@ -156,7 +216,7 @@ class ContextMemory:
         # Add recent session memory
         if self.session_memory:
             context.append("Recent conversation:")
-            for memory in self.session_memory[-3:]:  # Last 3 exchanges
+            for memory in list(self.session_memory)[-3:]:  # Last 3 exchanges
                 context.append(f"You: {memory['user_input']}")
                 context.append(f"AI: {memory['ai_response']}")
         
@@ -173,9 +233,16 @@ class ContextMemory:
         
         return "\n".join(context) if context else ""
     
-    def get_current_session_id(self):
+    def get_current_session_id(self, now=None):
         """Get current session identifier"""
-        return datetime.now().strftime("%Y%m%d_%H")
+        now = now or datetime.now()
+        
+        # Session ids only change once per hour, so reuse the formatted string
+        hour = (now.year, now.month, now.day, now.hour)
+        if hour != self.session_hour:
+            self.session_hour = hour
+            self.session_id = now.strftime("%Y%m%d_%H")
+        return self.session_id
     
     def search_memory(self, query):
         """Search through memory for relevant information"""
@@ -1,7 +1,47 @@
 import re
+import random
 from datetime import datetime
 
 class EmotionDetector:
+    # Empathetic replies per emotion, built once at class definition
+    EMPATHY_RESPONSES = {
+        'happy': (
+            "That's wonderful to hear! I'm glad you're feeling good.",
+            "Your happiness is contagious! What's making you so happy?",
+            "I love your positive energy! Keep that smile going."
+        ),
+        'sad': (
+            "I'm sorry you're feeling down. I'm here to listen if you want to talk.",
+            "It sounds like you're going through a tough time. How can I help?",
+            "I understand you're feeling sad. Sometimes talking helps."
+        ),
+        'angry': (
+            "I can sense you're frustrated. Let's work through this together.",
+            "It sounds like something really bothered you. Want to tell me about it?",
+            "I hear your frustration. Let me try to help you with this."
+        ),
+        'anxious': (
+            "I can tell you're feeling worried. Let's take this step by step.",
+            "It's okay to feel anxious. I'm here to help you through this.",
+            "Take a deep breath. We can figure this out together."
+        ),
+        'confused': (
+            "I can see this is confusing. Let me try to explain it more clearly.",
+            "No worries about being confused. Let's break this down together.",
+            "I understand this might be unclear. Let me help clarify."
+        ),
+        'tired': (
+            "You sound exhausted. Make sure you're getting enough rest.",
+            "It seems like you need a break. Take care of yourself.",
+            "Being tired can make everything harder. How can I help?"
+        ),
+        'excited': (
+            "I can feel your excitement! That's amazing!",
+            "Your enthusiasm is wonderful! Tell me more!",
+            "I love your energy! What's got you so excited?"
+        )
+    }
+    
     def __init__(self):
         self.emotion_keywords = {
             'happy': ['happy', 'joy', 'excited', 'great', 'awesome', 'wonderful', 'amazing', 'fantastic', 'good', 'smile', 'laugh'],
@@ -12,16 +52,29 @@ class EmotionDetector:
             'tired': ['tired', 'exhausted', 'sleepy', 'fatigue', 'worn out', 'drained'],
             'excited': ['excited', 'thrilled', 'pumped', 'eager', 'cant wait', "can't wait"]
         }
+        
+        # Map each keyword to the emotions it signals so detection is a
+        # single flat scan over the distinct keywords
+        self.keyword_emotions = {}
+        for emotion, keywords in self.emotion_keywords.items():
+            for keyword in keywords:
+                self.keyword_emotions.setdefault(keyword, []).append(emotion)
+        self.keywords = tuple(self.keyword_emotions)
     
     def detect_emotion(self, text):
         """Detect primary emotion from user text"""
         text_lower = text.lower()
         emotion_scores = {}
         
-        for emotion, keywords in self.emotion_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
-            if score > 0:
-                emotion_scores[emotion] = score
+        # Each distinct keyword found counts once per emotion it belongs to;
+        # str.__contains__ runs the substring search natively
+        found = [keyword for keyword in self.keywords if keyword in text_lower]
+        for keyword in found:
+            for emotion in self.keyword_emotions[keyword]:
+                emotion_scores[emotion] = emotion_scores.get(emotion, 0) + 1
+        
+        # Keep declaration order so ties resolve the same way as before
+        emotion_scores = {emotion: emotion_scores[emotion] for emotion in self.emotion_keywords if emotion in emotion_scores}
         
         if emotion_scores:
             primary_emotion = max(emotion_scores, key=emotion_scores.get)
@@ -32,46 +85,8 @@ class EmotionDetector:
     
     def get_empathetic_response(self, emotion, confidence):
         """Generate empathetic response based on emotion"""
-        responses = {
-            'happy': [
-                "That's wonderful to hear! I'm glad you're feeling good.",
-                "Your happiness is contagious! What's making you so happy?",
-                "I love your positive energy! Keep that smile going."
-            ],
-            'sad': [
-                "I'm sorry you're feeling down. I'm here to listen if you want to talk.",
-                "It sounds like you're going through a tough time. How can I help?",
-                "I understand you're feeling sad. Sometimes talking helps."
-            ],
-            'angry': [
-                "I can sense you're frustrated. Let's work through this together.",
-                "It sounds like something really bothered you. Want to tell me about it?",
-                "I hear your frustration. Let me try to help you with this."
-            ],
-            'anxious': [
-                "I can tell you're feeling worried. Let's take this step by step.",
-                "It's okay to feel anxious. I'm here to help you through this.",
-                "Take a deep breath. We can figure this out together."
-            ],
-            'confused': [
-                "I can see this is confusing. Let me try to explain it more clearly.",
-                "No worries about being confused. Let's break this down together.",
-                "I understand this might be unclear. Let me help clarify."
-            ],
-            'tired': [
-                "You sound exhausted. Make sure you're getting enough rest.",
-                "It seems like you need a break. Take care of yourself.",
-                "Being tired can make everything harder. How can I help?"
-            ],
-            'excited': [
-                "I can feel your excitement! That's amazing!",
-                "Your enthusiasm is wonderful! Tell me more!",
-                "I love your energy! What's got you so excited?"
-            ]
-        }
-        
-        import random
-        if emotion in responses:
-            return random.choice(responses[emotion])
+        responses = self.EMPATHY_RESPONSES.get(emotion)
+        if responses:
+            return responses[random.randrange(len(responses))]
         
         return "I'm here to help you with whatever you need."
\ No newline at end of file
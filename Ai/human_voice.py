@@ -1,36 +1,90 @@
-import pygame
-import os
+import io
 import time
+import threading
 import re
 import random
-from gtts import gTTS
-import pyttsx3
+from functools import lru_cache
+
+_CONTRACTIONS = {
+    "I am": "I'm",
+    "you are": "you're",
+    "cannot": "can't",
+    "do not": "don't",
+    "will not": "won't"
+}
+_CONTRACT_RE = re.compile("|".join(map(re.escape, _CONTRACTIONS)))
+_SENT_RE = re.compile(r'[^.!?]+')
+_CONNECTOR_RE = re.compile(r'because|however|therefore|although', re.I)
+
+# Speech rates: slower for important information, faster for casual chat
+_IMPORTANT_WORDS = ('important', 'remember', 'careful', 'attention')
+_CASUAL_WORDS = ('hello', 'hi', 'okay', 'sure', 'yes')
+_SPEECH_RATES = {'important': 160, 'casual': 190, 'normal': 175}
+
+@lru_cache(maxsize=32)
+def synthesize_speech(text):
+    """Render text to MP3 bytes with gTTS, caching recurring phrases"""
+    from gtts import gTTS
+    
+    # Use gTTS with natural settings
+    tts = gTTS(
+        text=text,
+        lang='en',
+        slow=False,
+        tld='com'  # More natural voice
+    )
+    
+    buffer = io.BytesIO()
+    tts.write_to_fp(buffer)
+    return buffer.getvalue()
 
 class HumanVoice:
     def __init__(self):
-        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
         self.voice_sample = r"C:\Users\shaik\Downloads\voice\download.wav"
-        self.setup_human_voice()
+        # Audio stacks are imported on first use to keep startup fast
+        self.engine = None
+        self.engine_ready = False
+        self.setup_lock = threading.Lock()  # Keeps concurrent speakers off a half-configured engine
+        self.current_rate = None  # Last rate sent to the engine
+        self.pygame = None
+        self.rng = random.Random()
     
     def setup_human_voice(self):
         """Setup human-like voice with natural settings"""
-        try:
-            self.engine = pyttsx3.init()
-            voices = self.engine.getProperty('voices')
-            
-            # Find most natural female voice
-            for voice in voices:
-                if any(word in voice.name.lower() for word in ['zira', 'hazel', 'eva']):
-                    self.engine.setProperty('voice', voice.id)
-                    break
-            
-            # Human-like speech settings
-            self.engine.setProperty('rate', 175)  # Natural conversational speed
-            self.engine.setProperty('volume', 0.95)
+        with self.setup_lock:
+            if self.engine_ready:
+                return
+            try:
+                import pyttsx3
+                engine = pyttsx3.init()
+                voices = engine.getProperty('voices')
+                
+                # Find most natural female voice
+                for voice in voices:
+                    if any(word in voice.name.lower() for word in ['zira', 'hazel', 'eva']):
+                        engine.setProperty('voice', voice.id)
+                        break
+                
+                # Human-like speech settings
+                engine.setProperty('rate', 175)  # Natural conversational speed
+                engine.setProperty('volume', 0.95)
+                self.current_rate = 175
+                self.engine = engine
+                
+            except Exception as e:
+                print(f"Voice setup error: {e}")
+                self.engine = None
             
-        except Exception as e:
-            print(f"Voice setup error: {e}")
-            self.engine = None
+            # Only mark ready once the engine is fully configured (or has failed)
+            self.engine_ready = True
+    
+    def setup_mixer(self):
+        """Import pygame and initialise the mixer on first playback"""
+        if self.pygame is None:
+            import pygame
+            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+            self.pygame = pygame
+        return self.pygame
     
     def speak(self, text):
         """Human-like speech with natural flow"""
@@ -45,29 +99,24 @@ class HumanVoice:
     
     def humanize_speech(self, text):
         """Make text more conversational and human-like"""
+        rand, choice = self.rng.random, self.rng.choice
+        
         # Add conversational fillers occasionally
         fillers = ["well", "you know", "actually", "I mean", "so"]
         
         # Add natural conversation starters
-        if random.random() < 0.3:  # 30% chance
+        if rand() < 0.3:  # 30% chance
             starters = ["Well, ", "So, ", "Actually, ", "You know, "]
-            text = random.choice(starters) + text.lower()
+            text = choice(starters) + text.lower()
         
         # Add thinking pauses for complex responses
         if len(text) > 100:
             thinking_words = ["hmm", "let me think", "well"]
-            if random.random() < 0.4:  # 40% chance for long responses
-                text = random.choice(thinking_words) + "... " + text
+            if rand() < 0.4:  # 40% chance for long responses
+                text = choice(thinking_words) + "... " + text
         
-        # Make responses more conversational
-        text = text.replace("I am", "I'm")
-        text = text.replace("you are", "you're")
-        text = text.replace("cannot", "can't")
-        text = text.replace("do not", "don't")
-        text = text.replace("will not", "won't")
-        
-        # Add natural emphasis
-        text = re.sub(r'\b(very|really|quite|extremely)\b', r'\\1', text)
+        # Make responses more conversational (single pass over all contractions)
+        text = _CONTRACT_RE.sub(lambda m: _CONTRACTIONS[m.group(0)], text)
         
         return text
     
@@ -75,24 +124,26 @@ class HumanVoice:
         """Add natural breathing and thinking pauses"""
         segments = []
         
-        # Split into sentences
-        sentences = re.split(r'[.!?]+', text)
-        
-        for i, sentence in enumerate(sentences):
-            if sentence.strip():
-                # Add breathing pause before longer sentences
-                if len(sentence) > 50 and i > 0:
-                    segments.append(("pause", "breath"))
-                
-                # Add thinking pause for complex ideas
-                if any(word in sentence.lower() for word in ['because', 'however', 'therefore', 'although']):
-                    segments.append(("pause", "think"))
-                
-                segments.append(("speech", sentence.strip()))
-                
-                # Add natural pause between sentences
-                if i < len(sentences) - 1:
-                    segments.append(("pause", "sentence"))
+        # Walk sentences in one pass over the text
+        text_length = len(text)
+        for match in _SENT_RE.finditer(text):
+            sentence = match.group().strip()
+            if not sentence:
+                continue
+            
+            # Add breathing pause before longer sentences
+            if match.end() - match.start() > 50 and match.start() > 0:
+                segments.append(("pause", "breath"))
+            
+            # Add thinking pause for complex ideas
+            if _CONNECTOR_RE.search(sentence):
+                segments.append(("pause", "think"))
+            
+            segments.append(("speech", sentence))
+            
+            # Add natural pause between sentences
+            if match.end() < text_length:
+                segments.append(("pause", "sentence"))
         
         return segments
     
@@ -123,19 +174,18 @@ class HumanVoice:
     def speak_naturally(self, text):
         """Speak with natural human-like delivery"""
         try:
-            # Adjust speech rate based on content
+            if not self.engine_ready:
+                self.setup_human_voice()
+            
+            # Adjust speech rate based on content, only touching the engine on change
             if self.engine:
-                # Slower for important information
-                if any(word in text.lower() for word in ['important', 'remember', 'careful', 'attention']):
-                    self.engine.setProperty('rate', 160)
-                # Faster for casual conversation
-                elif any(word in text.lower() for word in ['hello', 'hi', 'okay', 'sure', 'yes']):
-                    self.engine.setProperty('rate', 190)
-                else:
-                    self.engine.setProperty('rate', 175)  # Normal conversational
+                rate = _SPEECH_RATES[self.speech_profile(text)]
+                if rate != self.current_rate:
+                    self.engine.setProperty('rate', rate)
+                    self.current_rate = rate
                 
                 # Add slight volume variation for naturalness
-                volume = 0.9 + (random.random() * 0.1)  # 0.9 to 1.0
+                volume = 0.9 + (self.rng.random() * 0.1)  # 0.9 to 1.0
                 self.engine.setProperty('volume', volume)
                 
                 self.engine.say(text)
@@ -149,32 +199,29 @@ class HumanVoice:
             print(f"Natural speech error: {e}")
             return False
     
+    def speech_profile(self, text):
+        """Pick the delivery profile for a sentence"""
+        text_lower = text.lower()
+        if any(word in text_lower for word in _IMPORTANT_WORDS):
+            return 'important'
+        if any(word in text_lower for word in _CASUAL_WORDS):
+            return 'casual'
+        return 'normal'
+    
     def natural_gtts(self, text):
         """Natural gTTS with human-like characteristics"""
         try:
-            # Use gTTS with natural settings
-            tts = gTTS(
-                text=text,
-                lang='en',
-                slow=False,
-                tld='com'  # More natural voice
-            )
+            pygame = self.setup_mixer()
+            audio = synthesize_speech(text)
             
-            temp_file = f"human_voice_{int(time.time())}.mp3"
-            tts.save(temp_file)
-            
-            if os.path.exists(temp_file):
-                pygame.mixer.music.load(temp_file)
+            if audio:
+                # Play straight from memory instead of a temp file
+                pygame.mixer.music.load(io.BytesIO(audio), "mp3")
                 pygame.mixer.music.play()
                 
                 while pygame.mixer.music.get_busy():
                     pygame.time.wait(50)
                 
-                try:
-                    os.unlink(temp_file)
-                except:
-                    pass
-                
                 return True
             
             return False
@@ -185,17 +232,19 @@ class HumanVoice:
     
     def add_personality_to_response(self, text):
         """Add personality and human-like responses"""
+        rand, choice = self.rng.random, self.rng.choice
+        
         # Add emotional responses
         if "?" in text:
             responses = ["That's a great question! ", "Interesting question. ", "Let me think about that. "]
-            if random.random() < 0.4:
-                text = random.choice(responses) + text
+            if rand() < 0.4:
+                text = choice(responses) + text
         
         # Add acknowledgments
         if any(word in text.lower() for word in ['thank', 'thanks']):
             responses = ["You're welcome! ", "No problem! ", "Happy to help! "]
-            if random.random() < 0.5:
-                text = random.choice(responses) + text
+            if rand() < 0.5:
+                text = choice(responses) + text
         
         return text
 
@@ -1,131 +1,216 @@
 import json
 import os
+import time
+import atexit
+from collections import deque
+from typing import NamedTuple
+from functools import lru_cache
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard json module
+    orjson = None
+
+# Keyword tables for preference extraction and input classification
+_COLORS = ('red', 'blue', 'green', 'yellow', 'purple', 'orange', 'black', 'white')
+_FOODS = ('pizza', 'burger', 'pasta', 'rice', 'chicken', 'fish', 'salad')
+_GREETING_WORDS = ('hello', 'hi', 'hey', 'good morning')
+_CLOSING_WORDS = ('thanks', 'thank you', 'bye', 'goodbye')
+_REQUEST_WORDS = ('help', 'can you', 'please')
+
+# Conversation patterns are stored column-wise: one bounded deque per field
+_PATTERN_FIELDS = ('input', 'response', 'timestamp')
+
+class LearnedResponse(NamedTuple):
+    """A response that worked well, saved on disk as [response, success_count, timestamp]"""
+    response: str
+    success_count: int
+    timestamp: str
+    
+    @classmethod
+    def from_saved(cls, entry):
+        """Build from a saved entry (3-item list, or a dict from older files)"""
+        if isinstance(entry, dict):
+            return cls(entry.get('response'), entry.get('success_count', 0), entry.get('timestamp'))
+        return cls(*entry)
+
+@lru_cache(maxsize=2048)
+def classify_text(text):
+    """Classify lowercased user input (memoized for repeated inputs)"""
+    if any(word in text for word in _GREETING_WORDS):
+        return 'greeting'
+    elif '?' in text:
+        return 'question'
+    elif any(word in text for word in _CLOSING_WORDS):
+        return 'closing'
+    elif any(word in text for word in _REQUEST_WORDS):
+        return 'request'
+    else:
+        return 'general'
+
+@lru_cache(maxsize=4096)
+def _norm_key(text):
+    """Knowledge key for user input: lowercased, first 50 chars"""
+    return text.lower()[:50]
+
 class LearningSystem:
     def __init__(self):
         self.knowledge_file = "ai_learned_knowledge.json"
         self.user_preferences = "user_preferences.json"
         self.conversation_patterns = "conversation_patterns.json"
+        self.dirty_files = set()  # Files whose data changed since the last save
+        self.save_every_turns = 5  # Save after this many turns...
+        self.save_every_seconds = 30  # ...or once this much time has passed
+        self.turns_since_save = 0
+        self.last_save = time.monotonic()
         self.load_learned_data()
+        atexit.register(self.flush)
     
     def load_learned_data(self):
         """Load previously learned information"""
         try:
-            with open(self.knowledge_file, 'r') as f:
-                self.learned_knowledge = json.load(f)
+            knowledge = self.read_json_file(self.knowledge_file)
+            # Order responses best-first (stable, so earlier entries win ties)
+            self.learned_knowledge = {
+                key: sorted(map(LearnedResponse.from_saved, responses), key=lambda x: x.success_count, reverse=True)
+                for key, responses in knowledge.items()
+            }
         except:
             self.learned_knowledge = {}
         
         try:
-            with open(self.user_preferences, 'r') as f:
-                self.preferences = json.load(f)
+            self.preferences = self.read_json_file(self.user_preferences)
         except:
             self.preferences = {}
         
         try:
-            with open(self.conversation_patterns, 'r') as f:
-                self.patterns = json.load(f)
+            patterns = self.read_json_file(self.conversation_patterns)
+            self.patterns = {input_type: self.pattern_columns(entries) for input_type, entries in patterns.items()}
         except:
             self.patterns = {}
     
+    def pattern_columns(self, entries=None):
+        """Build per-field pattern columns from saved data (columns or legacy list of dicts)"""
+        entries = entries or {}
+        if isinstance(entries, list):
+            entries = {field: [entry.get(field) for entry in entries] for field in _PATTERN_FIELDS}
+        # Bounded per type: appends evict the oldest pattern automatically
+        return {field: deque(entries.get(field, ()), maxlen=10) for field in _PATTERN_FIELDS}
+    
+    def read_json_file(self, path):
+        """Read a JSON file, using orjson when it is installed"""
+        if orjson:
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(path, 'r') as f:
+            return json.load(f)
+    
+    def write_json_file(self, path, data):
+        """Write a JSON file atomically, using orjson when it is installed"""
+        if orjson:
+            payload = orjson.dumps(data, default=list, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, indent=2, default=list).encode('utf-8')
+        
+        # One write to a temp file, then rename so readers never see a partial file
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    
     def learn_from_conversation(self, user_input, ai_response, user_feedback=None):
         """Learn from each conversation"""
         timestamp = datetime.now().isoformat()
+        text = user_input.lower()  # Lowercase once for every step
         
         # Learn user preferences
-        self.extract_preferences(user_input)
+        self.extract_preferences(user_input, text)
         
         # Learn conversation patterns
-        self.analyze_conversation_pattern(user_input, ai_response)
+        self.analyze_conversation_pattern(user_input, ai_response, timestamp, text)
         
         # Store successful responses
-        if user_feedback == "good" or any(word in user_input.lower() for word in ['thanks', 'good', 'great', 'perfect']):
-            self.store_successful_response(user_input, ai_response)
+        if user_feedback == "good" or any(word in text for word in ['thanks', 'good', 'great', 'perfect']):
+            self.store_successful_response(user_input, ai_response, timestamp)
         
-        self.save_learned_data()
+        # Debounce disk writes across turns
+        self.turns_since_save += 1
+        if (self.turns_since_save >= self.save_every_turns or
+                time.monotonic() - self.last_save >= self.save_every_seconds):
+            self.save_learned_data()
     
-    def extract_preferences(self, user_input):
+    def extract_preferences(self, user_input, text=None):
         """Extract user preferences from conversation"""
-        text = user_input.lower()
+        text = text or user_input.lower()
         
         # Favorite things
         if "my favorite" in text or "i like" in text or "i love" in text:
             if "color" in text:
-                colors = ['red', 'blue', 'green', 'yellow', 'purple', 'orange', 'black', 'white']
-                for color in colors:
+                for color in _COLORS:
                     if color in text:
                         self.preferences['favorite_color'] = color
+                        self.dirty_files.add(self.user_preferences)
             
             if "food" in text:
-                foods = ['pizza', 'burger', 'pasta', 'rice', 'chicken', 'fish', 'salad']
-                for food in foods:
+                for food in _FOODS:
                     if food in text:
                         self.preferences['favorite_food'] = food
+                        self.dirty_files.add(self.user_preferences)
         
         # Personal info
         if "my name is" in text:
             name = text.split("my name is")[-1].strip().split()[0]
             self.preferences['name'] = name
+            self.dirty_files.add(self.user_preferences)
         
         if "i am from" in text or "i live in" in text:
             location = text.split("from" if "from" in text else "in")[-1].strip()
             self.preferences['location'] = location
+            self.dirty_files.add(self.user_preferences)
     
-    def analyze_conversation_pattern(self, user_input, ai_response):
+    def analyze_conversation_pattern(self, user_input, ai_response, timestamp=None, text=None):
         """Analyze and learn conversation patterns"""
-        input_type = self.classify_input_type(user_input)
+        input_type = classify_text(text) if text else self.classify_input_type(user_input)
         
-        if input_type not in self.patterns:
-            self.patterns[input_type] = []
+        columns = self.patterns.get(input_type)
+        if columns is None:
+            columns = self.patterns[input_type] = self.pattern_columns()  # Keep only recent patterns
         
-        self.patterns[input_type].append({
-            'input': user_input,
-            'response': ai_response,
-            'timestamp': datetime.now().isoformat()
-        })
+        columns['input'].append(user_input)
+        columns['response'].append(ai_response)
+        columns['timestamp'].append(timestamp or datetime.now().isoformat())
         
-        # Keep only recent patterns (last 10)
-        if len(self.patterns[input_type]) > 10:
-            self.patterns[input_type] = self.patterns[input_type][-10:]
+        self.dirty_files.add(self.conversation_patterns)
     
     def classify_input_type(self, user_input):
         """Classify the type of user input"""
-        text = user_input.lower()
-        
-        if any(word in text for word in ['hello', 'hi', 'hey', 'good morning']):
-            return 'greeting'
-        elif '?' in text:
-            return 'question'
-        elif any(word in text for word in ['thanks', 'thank you', 'bye', 'goodbye']):
-            return 'closing'
-        elif any(word in text for word in ['help', 'can you', 'please']):
-            return 'request'
-        else:
-            return 'general'
+        return classify_text(user_input.lower())
     
-    def store_successful_response(self, user_input, ai_response):
+    def store_successful_response(self, user_input, ai_response, timestamp=None):
         """Store responses that worked well"""
-        key = user_input.lower()[:50]  # Use first 50 chars as key
+        key = _norm_key(user_input)  # Use first 50 chars as key
         
-        if key not in self.learned_knowledge:
-            self.learned_knowledge[key] = []
+        responses = self.learned_knowledge.setdefault(key, [])
+        entry = LearnedResponse(ai_response, 1, timestamp or datetime.now().isoformat())
         
-        self.learned_knowledge[key].append({
-            'response': ai_response,
-            'success_count': 1,
-            'timestamp': datetime.now().isoformat()
-        })
+        # Keep the list ordered by success count so the best response is first
+        position = len(responses)
+        while position and responses[position - 1].success_count < entry.success_count:
+            position -= 1
+        responses.insert(position, entry)
+        self.dirty_files.add(self.knowledge_file)
     
     def get_personalized_response(self, user_input):
         """Get personalized response based on learned data"""
         # Check for similar previous successful responses
-        key = user_input.lower()[:50]
+        key = _norm_key(user_input)
         
-        if key in self.learned_knowledge:
-            best_response = max(self.learned_knowledge[key], 
-                              key=lambda x: x.get('success_count', 0))
-            return best_response['response']
+        responses = self.learned_knowledge.get(key)
+        if responses:
+            return responses[0].response
         
         # Use preferences to personalize
         if self.preferences.get('name'):
@@ -137,26 +222,36 @@ class LearningSystem:
         """Get response based on learned patterns"""
         input_type = self.classify_input_type(user_input)
         
-        if input_type in self.patterns and self.patterns[input_type]:
+        if input_type in self.patterns and self.patterns[input_type]['response']:
             # Use most recent successful pattern
-            recent_pattern = self.patterns[input_type][-1]
-            return f"Based on our previous conversations, {recent_pattern['response']}"
+            recent_response = self.patterns[input_type]['response'][-1]
+            return f"Based on our previous conversations, {recent_response}"
         
         return "Let me help you with that."
     
     def save_learned_data(self):
-        """Save all learned data to files"""
+        """Save learned data files that changed since the last save"""
+        data_by_file = {
+            self.knowledge_file: self.learned_knowledge,
+            self.user_preferences: self.preferences,
+            self.conversation_patterns: self.patterns
+        }
+        
         try:
-            with open(self.knowledge_file, 'w') as f:
-                json.dump(self.learned_knowledge, f, indent=2)
-            
-            with open(self.user_preferences, 'w') as f:
-                json.dump(self.preferences, f, indent=2)
-            
-            with open(self.conversation_patterns, 'w') as f:
-                json.dump(self.patterns, f, indent=2)
+            for path, data in data_by_file.items():
+                if path in self.dirty_files:
+                    self.write_json_file(path, data)
+                    self.dirty_files.discard(path)
         except Exception as e:
             print(f"Error saving learned data: {e}")
+        
+        self.turns_since_save = 0
+        self.last_save = time.monotonic()
+    
+    def flush(self):
+        """Write any unsaved learned data (called at shutdown)"""
+        if self.dirty_files:
+            self.save_learned_data()
     
     def get_learning_stats(self):
         """Get statistics about what AI has learned"""
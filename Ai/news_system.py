@@ -1,7 +1,13 @@
-import requests
 import json
 from datetime import datetime, timedelta
 
+_DIGIT_PREFIX = tuple('0123456789')  # Numbered result lines start a new item
+
+def _get_search():
+    """Return the process-wide LiveWebSearch, importing it on first use"""
+    from web_search_live import get_shared_search
+    return get_shared_search()
+
 class NewsSystem:
     def __init__(self):
         # Free news APIs (no key required)
@@ -16,11 +22,11 @@ class NewsSystem:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
     
-    def get_latest_news(self, category="general", count=5):
-        """Get latest news headlines"""
+    def get_latest_news(self, category="general", count=5, refresh=False, quiet=False):
+        """Get latest news headlines (quiet=True keeps background refreshes from printing)"""
         try:
             # Try multiple sources
-            news = self.get_news_from_web_search(category, count)
+            news = self.get_news_from_web_search(category, count, refresh, quiet)
             
             if not news:
                 news = self.get_fallback_news(category)
@@ -28,15 +34,14 @@ class NewsSystem:
             return self.format_news(news, category)
             
         except Exception as e:
-            print(f"News error: {e}")
+            if not quiet:
+                print(f"News error: {e}")
             return "I'm having trouble getting the latest news right now. Please try again later."
     
-    def get_news_from_web_search(self, category, count):
+    def get_news_from_web_search(self, category, count, refresh=False, quiet=False):
         """Get news using web search"""
         try:
-            from web_search_live import LiveWebSearch
-            
-            search = LiveWebSearch()
+            search = _get_search()
             
             # Search for recent news
             if category == "general":
@@ -44,7 +49,7 @@ class NewsSystem:
             else:
                 query = f"latest {category} news today"
             
-            results = search.search_web(query, max_results=count)
+            results = search.search_web(query, max_results=count, refresh=refresh, quiet=quiet)
             
             # Convert search results to news format
             news_items = []
@@ -53,12 +58,15 @@ class NewsSystem:
                 current_item = {}
                 
                 for line in lines:
-                    if line.strip() and line[0].isdigit():
+                    stripped = line.strip()
+                    if not stripped:
+                        continue
+                    if line.startswith(_DIGIT_PREFIX):
                         if current_item:
                             news_items.append(current_item)
-                        current_item = {'title': line.strip()}
-                    elif line.strip() and 'title' in current_item:
-                        current_item['description'] = line.strip()
+                        current_item = {'title': stripped}
+                    elif 'title' in current_item:
+                        current_item['description'] = stripped
                 
                 if current_item:
                     news_items.append(current_item)
@@ -66,7 +74,8 @@ class NewsSystem:
             return news_items
             
         except Exception as e:
-            print(f"Web search news error: {e}")
+            if not quiet:
+                print(f"Web search news error: {e}")
             return []
     
     def get_fallback_news(self, category):
@@ -96,25 +105,22 @@ class NewsSystem:
         if not news_items:
             return f"No {category} news available at the moment."
         
-        formatted = f"📰 Latest {category.title()} News ({datetime.now().strftime('%Y-%m-%d %H:%M')}):\n\n"
+        parts = [f"📰 Latest {category.title()} News ({datetime.now().strftime('%Y-%m-%d %H:%M')}):\n\n"]
         
         for i, item in enumerate(news_items[:5], 1):
             title = item.get('title', 'No title')
             description = item.get('description', 'No description available')
             
-            formatted += f"{i}. {title}\n"
-            formatted += f"   {description}\n\n"
+            parts.append(f"{i}. {title}\n   {description}\n\n")
         
-        formatted += "Note: News information is gathered from various sources and updated regularly."
+        parts.append("Note: News information is gathered from various sources and updated regularly.")
         
-        return formatted
+        return ''.join(parts)
     
     def get_news_by_topic(self, topic):
         """Get news about specific topic"""
         try:
-            from web_search_live import LiveWebSearch
-            
-            search = LiveWebSearch()
+            search = _get_search()
             query = f"{topic} news latest updates today"
             
             results = search.search_web(query, max_results=4)
@@ -130,9 +136,7 @@ class NewsSystem:
     def get_breaking_news(self):
         """Get breaking news alerts"""
         try:
-            from web_search_live import LiveWebSearch
-            
-            search = LiveWebSearch()
+            search = _get_search()
             query = "breaking news alerts today urgent"
             
             results = search.search_web(query, max_results=3)
@@ -148,9 +152,7 @@ class NewsSystem:
     def get_local_news(self, location):
         """Get local news for specific location"""
         try:
-            from web_search_live import LiveWebSearch
-            
-            search = LiveWebSearch()
+            search = _get_search()
             query = f"{location} local news today headlines"
             
             results = search.search_web(query, max_results=4)
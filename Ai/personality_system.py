@@ -1,65 +1,97 @@
 import random
 from datetime import datetime
 
+# Phrases the personality styles pick from, built once at import
+_JOKES = (
+    " (No pun intended... okay, maybe a little intended!)",
+    " Speaking of which, why don't scientists trust atoms? Because they make up everything!",
+    " That's what I call a 'byte' of information! Get it? Byte? I'll see myself out...",
+)
+_PROFESSIONAL_STARTERS = (
+    "Based on available information, ",
+    "According to current data, ",
+    "From a professional standpoint, "
+)
+_ENERGETIC_ADDITIONS = (
+    " Let's make it happen!",
+    " This is going to be great!",
+    " I'm excited to help with this!"
+)
+_WISE_STARTERS = (
+    "In my contemplation, ",
+    "Through careful consideration, ",
+    "Reflecting on this matter, "
+)
+_WISE_ENDINGS = (
+    " Such is the nature of knowledge.",
+    " This requires thoughtful consideration.",
+    " Wisdom comes through understanding."
+)
+
 class PersonalitySystem:
     def __init__(self):
         self.current_personality = "friendly"
+        self.rng = random.Random()
         self.personalities = {
             "friendly": {
-                "greeting": ["Hello there! How can I help you today?", "Hi! Great to see you!", "Hey! What's on your mind?"],
+                "greeting": ("Hello there! How can I help you today?", "Hi! Great to see you!", "Hey! What's on your mind?"),
                 "response_style": "warm and welcoming",
-                "traits": ["helpful", "cheerful", "supportive"],
-                "speech_patterns": ["I'd love to help!", "That sounds interesting!", "Great question!"]
+                "traits": ("helpful", "cheerful", "supportive"),
+                "speech_patterns": ("I'd love to help!", "That sounds interesting!", "Great question!")
             },
             
             "professional": {
-                "greeting": ["Good day. How may I assist you?", "Hello. What can I help you with?", "Greetings. How can I be of service?"],
+                "greeting": ("Good day. How may I assist you?", "Hello. What can I help you with?", "Greetings. How can I be of service?"),
                 "response_style": "formal and efficient",
-                "traits": ["precise", "knowledgeable", "reliable"],
-                "speech_patterns": ["I can provide information on", "According to my analysis", "The optimal solution would be"]
+                "traits": ("precise", "knowledgeable", "reliable"),
+                "speech_patterns": ("I can provide information on", "According to my analysis", "The optimal solution would be")
             },
             
             "funny": {
-                "greeting": ["Hey there, human! Ready for some fun?", "Hello! I promise not to make too many bad jokes... maybe.", "Hi! Warning: Dad jokes may occur."],
+                "greeting": ("Hey there, human! Ready for some fun?", "Hello! I promise not to make too many bad jokes... maybe.", "Hi! Warning: Dad jokes may occur."),
                 "response_style": "humorous and playful",
-                "traits": ["witty", "playful", "entertaining"],
-                "speech_patterns": ["That reminds me of a joke...", "Funny you should ask!", "Here's a fun fact:"]
+                "traits": ("witty", "playful", "entertaining"),
+                "speech_patterns": ("That reminds me of a joke...", "Funny you should ask!", "Here's a fun fact:")
             },
             
             "wise": {
-                "greeting": ["Greetings, seeker of knowledge.", "Hello. What wisdom do you seek today?", "Welcome. I sense you have questions."],
+                "greeting": ("Greetings, seeker of knowledge.", "Hello. What wisdom do you seek today?", "Welcome. I sense you have questions."),
                 "response_style": "thoughtful and philosophical",
-                "traits": ["contemplative", "insightful", "patient"],
-                "speech_patterns": ["Consider this perspective:", "In my experience,", "Wisdom suggests that"]
+                "traits": ("contemplative", "insightful", "patient"),
+                "speech_patterns": ("Consider this perspective:", "In my experience,", "Wisdom suggests that")
             },
             
             "energetic": {
-                "greeting": ["HEY THERE! Ready to tackle the day?", "Hello! I'm super excited to help!", "Hi! Let's make something awesome happen!"],
+                "greeting": ("HEY THERE! Ready to tackle the day?", "Hello! I'm super excited to help!", "Hi! Let's make something awesome happen!"),
                 "response_style": "enthusiastic and motivating",
-                "traits": ["energetic", "motivational", "optimistic"],
-                "speech_patterns": ["That's AMAZING!", "Let's do this!", "You've got this!"]
+                "traits": ("energetic", "motivational", "optimistic"),
+                "speech_patterns": ("That's AMAZING!", "Let's do this!", "You've got this!")
             }
         }
+        self.personality_names = frozenset(self.personalities)
     
     def set_personality(self, personality_name):
         """Change AI personality"""
-        if personality_name.lower() in self.personalities:
-            self.current_personality = personality_name.lower()
+        name = personality_name.lower()
+        if name == self.current_personality:
+            return True
+        if name in self.personality_names:
+            self.current_personality = name
             return True
         return False
     
     def get_personality_greeting(self):
         """Get greeting based on current personality"""
         personality = self.personalities[self.current_personality]
-        return random.choice(personality["greeting"])
+        return self.rng.choice(personality["greeting"])
     
     def apply_personality_to_response(self, response):
         """Apply current personality style to response"""
         personality = self.personalities[self.current_personality]
         
         # Add personality-specific speech patterns
-        if random.random() < 0.3:  # 30% chance to add personality flair
-            pattern = random.choice(personality["speech_patterns"])
+        if self.rng.random() < 0.3:  # 30% chance to add personality flair
+            pattern = self.rng.choice(personality["speech_patterns"])
             response = pattern + " " + response
         
         # Modify response based on personality
@@ -76,14 +108,8 @@ class PersonalitySystem:
     
     def add_humor(self, response):
         """Add humor to response"""
-        jokes = [
-            " (No pun intended... okay, maybe a little intended!)",
-            " Speaking of which, why don't scientists trust atoms? Because they make up everything!",
-            " That's what I call a 'byte' of information! Get it? Byte? I'll see myself out...",
-        ]
-        
-        if random.random() < 0.2:  # 20% chance for joke
-            response += random.choice(jokes)
+        if self.rng.random() < 0.2:  # 20% chance for joke
+            response += self.rng.choice(_JOKES)
         
         # Make response more playful
         response = response.replace("I think", "I reckon")
@@ -99,14 +125,8 @@ class PersonalitySystem:
         response = response.replace("really", "particularly")
         
         # Add professional phrases
-        professional_starters = [
-            "Based on available information, ",
-            "According to current data, ",
-            "From a professional standpoint, "
-        ]
-        
-        if random.random() < 0.3:
-            response = random.choice(professional_starters) + response.lower()
+        if self.rng.random() < 0.3:
+            response = self.rng.choice(_PROFESSIONAL_STARTERS) + response.lower()
         
         return response
     
@@ -121,36 +141,18 @@ class PersonalitySystem:
         response = response.replace("yes", "ABSOLUTELY YES")
         response = response.replace("I can", "I'd LOVE to")
         
-        energetic_additions = [
-            " Let's make it happen!",
-            " This is going to be great!",
-            " I'm excited to help with this!"
-        ]
-        
-        if random.random() < 0.4:
-            response += random.choice(energetic_additions)
+        if self.rng.random() < 0.4:
+            response += self.rng.choice(_ENERGETIC_ADDITIONS)
         
         return response
     
     def add_wisdom(self, response):
         """Add wisdom and thoughtfulness"""
-        wise_starters = [
-            "In my contemplation, ",
-            "Through careful consideration, ",
-            "Reflecting on this matter, "
-        ]
-        
-        wise_endings = [
-            " Such is the nature of knowledge.",
-            " This requires thoughtful consideration.",
-            " Wisdom comes through understanding."
-        ]
-        
-        if random.random() < 0.3:
-            response = random.choice(wise_starters) + response.lower()
+        if self.rng.random() < 0.3:
+            response = self.rng.choice(_WISE_STARTERS) + response.lower()
         
-        if random.random() < 0.2:
-            response += random.choice(wise_endings)
+        if self.rng.random() < 0.2:
+            response += self.rng.choice(_WISE_ENDINGS)
         
         return response
     
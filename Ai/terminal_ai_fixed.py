@@ -6,15 +6,25 @@ Upgraded with enhanced performance, better error handling, and advanced features
 
 import ollama
 import threading
+import atexit
+import hashlib
 import json
 import os
+import re
+import sys
 import time
 import asyncio
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
 from functools import lru_cache, wraps
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard json module
+    orjson = None
+
 # Core AI modules
 from human_voice import HumanVoice
 from common_sense import CommonSense
@@ -22,9 +32,79 @@ from emotion_detector import EmotionDetector
 from learning_system import LearningSystem
 from personality_system import PersonalitySystem
 from context_memory import ContextMemory
-from web_search_live import LiveWebSearch
+from web_search_live import get_shared_search
 from news_system import NewsSystem
 
+# The module-level ollama functions use a client with no HTTP timeout, so a server that
+# stalls before or between tokens would hang the caller; this read timeout ends the stall
+_OLLAMA_CLIENT = ollama.Client(timeout=30)
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when it is installed"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+def _phrase_re(phrases):
+    """Compile phrases into one alternation (substring match, like `phrase in text`)"""
+    return re.compile("|".join(map(re.escape, phrases)))
+
+# Search decision keyword tables, compiled once
+_SKIP_PHRASES = frozenset([
+    'hello', 'hi', 'hey', 'thanks', 'thank you', 'bye', 'goodbye',
+    'how are you', 'what can you do', 'who are you', 'good morning',
+    'good evening', 'nice', 'great', 'okay', 'yes', 'no', 'sure',
+    'alright', 'fine', 'cool', 'awesome', 'perfect'
+])
+_SKIP_RE = _phrase_re(sorted(_SKIP_PHRASES))
+_COMMAND_RE = _phrase_re([
+    'personality', 'memory stats', 'voice test', 'breaking news',
+    'news', 'search live', 'ask me a question', 'quiz me'
+])
+_PRIORITY_RE = _phrase_re([
+    'current', 'latest', 'recent', 'today', 'now', '2024', '2025',
+    'breaking', 'live', 'real-time', 'up-to-date'
+])
+_INFO_REQUEST_RE = _phrase_re([
+    'price of', 'cost of', 'statistics', 'population', 'rate',
+    'weather in', 'temperature', 'forecast', 'news about',
+    'best colleges', 'best hospitals', 'best restaurants',
+    'deaths in', 'mortality', 'crime rate', 'happened in'
+])
+_LOCATION_RE = _phrase_re(['near me', 'in my area', 'pincode', 'pin code'])
+_BASIC_KNOWLEDGE_RE = _phrase_re([
+    'what is love', 'what is life', 'what is happiness',
+    'what is water', 'what is fire', 'what is human',
+    'bones in human', 'human bones'
+])
+_QUESTION_WORDS = ('what', 'how', 'when', 'where', 'why', 'who')
+
+# Response enhancement triggers
+_SAFETY_RE = _phrase_re(['dangerous', 'harmful', 'illegal', 'unsafe', 'hurt', 'damage'])
+_IMPOSSIBLE_RE = _phrase_re(['fly without', 'breathe underwater', 'time travel', 'live forever'])
+_MEMORY_TRIGGER_RE = _phrase_re([
+    'remember', 'earlier', 'before', 'previous', 'last time',
+    'you said', 'we talked', 'mentioned', 'discussed'
+])
+
+_PINCODE_RE = re.compile(r'\b\d{6}\b')
+_PRONOUNS = frozenset({'it', 'that', 'this', 'they', 'them', 'he', 'she', 'his', 'her'})
+_PRONOUN_TOKEN_RE = re.compile(r"[a-z']+")
+
+# Canned replies when the model is unavailable, checked in order
+_FALLBACK_RESPONSES = (
+    ("hello", "Hello! How can I help you today?"),
+    ("hi", "Hi there! What can I do for you?"),
+    ("how are you", "I'm doing well, thank you! How are you?"),
+    ("thanks", "You're welcome! Happy to help!"),
+    ("bye", "Goodbye! Have a great day!")
+)
+
+
 
 class TerminalAI:
     """Advanced AI Assistant with enhanced capabilities and performance optimizations"""
@@ -32,8 +112,11 @@ class TerminalAI:
     def __init__(self):
         # Core configuration
         self.knowledge_file = "ai_knowledge.json"
-        self.conversation_context = []
-        self.conversation_memory = []
+        self.knowledge_log_file = "ai_knowledge.jsonl"  # Append-only log of knowledge updates
+        self.knowledge_compact_interval = 100  # Rewrite the full knowledge file every N logged updates
+        self.knowledge_lock = threading.Lock()  # save_knowledge runs on worker threads
+        self.conversation_context = deque(maxlen=20)  # Oldest turns drop off automatically
+        self.conversation_memory = deque(maxlen=15)
         self.current_language = "english"
         self.debug_mode = False
         
@@ -57,7 +140,7 @@ class TerminalAI:
             self.learning_system = LearningSystem()
             self.personality_system = PersonalitySystem()
             self.context_memory = ContextMemory()
-            self.web_search = LiveWebSearch()
+            self.web_search = get_shared_search()  # Same instance NewsSystem uses
             self.news_system = NewsSystem()
             
             # Translation service (simplified)
@@ -80,12 +163,26 @@ class TerminalAI:
     
     def _setup_performance_optimizations(self):
         """Setup performance optimizations"""
-        self.executor = ThreadPoolExecutor(max_workers=6, thread_name_prefix="AI-Worker")
-        self.response_cache = {}
-        self.search_cache = {}
-        self.cache_ttl = 3600  # 1 hour
-        self.last_cache_clear = datetime.now()
+        # Work is I/O bound (Ollama, web search, file writes), so size the pool well above the CPU count
+        default_workers = max(8, min(32, (os.cpu_count() or 4) * 5))
+        try:
+            workers = int(os.environ.get("AI_WORKER_THREADS", default_workers))
+        except ValueError:
+            workers = default_workers
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="AI-Worker")
+        self.response_cache = OrderedDict()  # LRU of key -> (value, expiry), most recent at the end
+        self.search_cache = OrderedDict()
+        self.cache_ttl = 3600  # 1 hour per entry
+        self.last_cache_clear = time.monotonic()
         self.max_cache_size = 1000
+        self.system_prompt_cache = {}  # Personality name -> system prompt
+        self.inflight_calls: Dict[bytes, Future] = {}  # Cache key -> Ollama call in progress
+        self.inflight_lock = threading.Lock()
+        self.news_refresh_interval = 240  # Seconds; re-fetches before the 5 minute search cache entry expires
+        self.news_refresh_idle_limit = 900  # Seconds without user input before refreshing pauses
+        self.last_input_time = time.monotonic()
+        self.stop_background = threading.Event()
+        self.search_timeout = 10  # Seconds to wait for search before using the direct answer
         
         # Performance metrics
         self.performance_stats = {
@@ -94,6 +191,7 @@ class TerminalAI:
             "search_requests": 0,
             "average_response_time": 0
         }
+        self.response_time_samples = deque(maxlen=1024)  # Recent timings for percentiles
     
     def _load_initial_data(self):
         """Load initial knowledge and data"""
@@ -112,7 +210,9 @@ class TerminalAI:
         future = self.executor.submit(self.voice.speak, optimized_text)
         return future
     
-    def _optimize_text_for_speech(self, text: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _optimize_text_for_speech(text: str) -> str:
         """Optimize text for better speech synthesis"""
         # Remove excessive punctuation
         text = text.replace("...", ". ")
@@ -127,30 +227,53 @@ class TerminalAI:
         return text
 
     def _clear_old_cache(self):
-        """Enhanced cache management with size limits"""
-        now = datetime.now()
+        """Periodically sweep expired entries from the caches"""
+        now = time.monotonic()
+        if now - self.last_cache_clear < self.cache_ttl:
+            return
+        
+        for cache in (self.response_cache, self.search_cache):
+            expired = [key for key, (_, expiry) in cache.items() if expiry <= now]
+            for key in expired:
+                del cache[key]
+        self.last_cache_clear = now
+    
+    def _cache_get(self, cache: OrderedDict, key: bytes) -> Optional[str]:
+        """Look up a live cached value and mark it as recently used"""
+        entry = cache.get(key)
+        if entry is None:
+            return None
         
-        # Clear by TTL
-        if (now - self.last_cache_clear).total_seconds() > self.cache_ttl:
-            self.response_cache.clear()
-            self.search_cache.clear()
-            self.last_cache_clear = now
-            print("🗑️ Cache cleared (TTL expired)")
+        value, expiry = entry
+        if expiry <= time.monotonic():
+            del cache[key]  # Expire lazily on lookup
+            return None
         
-        # Clear by size limit
-        if len(self.response_cache) > self.max_cache_size:
-            # Keep only recent 50% of cache
-            items = list(self.response_cache.items())
-            self.response_cache = dict(items[-self.max_cache_size//2:])
-            print("🗑️ Cache optimized (size limit)")
+        cache.move_to_end(key)
+        return value
+    
+    def _cache_put(self, cache: OrderedDict, key: bytes, value: str):
+        """Cache a value with its own expiry, evicting the least recently used entries over the size limit"""
+        cache[key] = (value, time.monotonic() + self.cache_ttl)
+        cache.move_to_end(key)
+        while len(cache) > self.max_cache_size:
+            cache.popitem(last=False)
+        self._clear_old_cache()
     
     def get_performance_stats(self) -> Dict:
         """Get current performance statistics"""
         cache_hit_rate = (self.performance_stats["cache_hits"] / 
                          max(self.performance_stats["total_queries"], 1)) * 100
         
+        # Tail latency from recent samples (the mean hides slow outliers)
+        samples = sorted(self.response_time_samples)
+        p50 = samples[len(samples) // 2] if samples else 0
+        p95 = samples[min(int(len(samples) * 0.95), len(samples) - 1)] if samples else 0
+        
         return {
             **self.performance_stats,
+            "p50_response_time": round(p50, 3),
+            "p95_response_time": round(p95, 3),
             "cache_hit_rate": f"{cache_hit_rate:.1f}%",
             "cache_size": len(self.response_cache),
             "search_cache_size": len(self.search_cache)
@@ -162,12 +285,13 @@ class TerminalAI:
         
         # Clean and optimize query
         clean_query = self._clean_search_query(query)
-        cache_key = clean_query.lower()[:100]  # Limit key length
+        cache_key = self._generate_cache_key(clean_query, "")
         
         # Check cache first
-        if cache_key in self.search_cache:
+        cached = self._cache_get(self.search_cache, cache_key)
+        if cached is not None:
             self.performance_stats["cache_hits"] += 1
-            return self.search_cache[cache_key]
+            return cached
         
         # Perform search
         try:
@@ -176,7 +300,7 @@ class TerminalAI:
             
             # Cache successful results
             if result and "error" not in result.lower():
-                self.search_cache[cache_key] = result
+                self._cache_put(self.search_cache, cache_key, result)
             
             # Update performance stats
             search_time = time.time() - start_time
@@ -188,7 +312,9 @@ class TerminalAI:
             print(f"⚠️ Search error: {e}")
             return f"I couldn't search for '{clean_query}' right now, but I can provide general information."
     
-    def _clean_search_query(self, query: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _clean_search_query(query: str) -> str:
         """Clean and optimize search query"""
         # Extract main question from context
         if "Current question:" in query:
@@ -207,6 +333,8 @@ class TerminalAI:
     
     def _update_response_time(self, response_time: float):
         """Update average response time statistics"""
+        self.response_time_samples.append(response_time)
+        
         current_avg = self.performance_stats["average_response_time"]
         total_queries = self.performance_stats["total_queries"]
         
@@ -220,7 +348,8 @@ class TerminalAI:
     
 
     
-    def get_ai_response(self, prompt: str, context: str = "", show_thinking: bool = False) -> str:
+    def get_ai_response(self, prompt: str, context: str = "", show_thinking: bool = False,
+                        cancel_event: Optional[threading.Event] = None) -> str:
         """Enhanced AI response with better error handling and optimization"""
         start_time = time.time()
         
@@ -230,20 +359,21 @@ class TerminalAI:
             
             # Check cache first
             cache_key = self._generate_cache_key(prompt, context)
-            if cache_key in self.response_cache:
+            cached = self._cache_get(self.response_cache, cache_key)
+            if cached is not None:
                 self.performance_stats["cache_hits"] += 1
-                return self.response_cache[cache_key]
+                return cached
             
             # Prepare optimized prompt
             system_prompt = self._get_system_prompt()
             full_prompt = self._prepare_full_prompt(prompt, context)
             
-            # Get AI response with timeout
-            response = self._call_ollama_with_timeout(system_prompt, full_prompt)
+            # Get AI response with timeout (sharing any identical call already running)
+            response = self._call_ollama_single_flight(cache_key, system_prompt, full_prompt, cancel_event)
             
             if response:
                 # Cache successful response
-                self.response_cache[cache_key] = response
+                self._cache_put(self.response_cache, cache_key, response)
                 
                 # Update performance stats
                 response_time = time.time() - start_time
@@ -257,13 +387,44 @@ class TerminalAI:
             print(f"⚠️ AI Response Error: {e}")
             return self._get_fallback_response(prompt)
     
-    def _generate_cache_key(self, prompt: str, context: str) -> str:
-        """Generate optimized cache key"""
-        combined = f"{prompt}:{context}"
-        return combined.lower()[:100]  # Limit key length
+    def _call_ollama_single_flight(self, cache_key: bytes, system_prompt: str, full_prompt: str,
+                                   cancel_event: Optional[threading.Event] = None) -> Optional[str]:
+        """Call Ollama once per cache key; concurrent duplicates wait for the same result"""
+        with self.inflight_lock:
+            future = self.inflight_calls.get(cache_key)
+            # A cancellable call never leads, so cancelling it can't fail other callers
+            leader = future is None and cancel_event is None
+            if leader:
+                future = self.inflight_calls[cache_key] = Future()
+        
+        if future is None:
+            return self._call_ollama_with_timeout(system_prompt, full_prompt, cancel_event=cancel_event)
+        if not leader:
+            return future.result()
+        
+        # The first caller makes the call on its own thread and shares the result
+        response = None
+        try:
+            response = self._call_ollama_with_timeout(system_prompt, full_prompt)
+        finally:
+            with self.inflight_lock:
+                del self.inflight_calls[cache_key]
+            future.set_result(response)
+        return response
+    
+    def _generate_cache_key(self, prompt: str, context: str) -> bytes:
+        """Generate a fixed-size cache key from the full (case-insensitive) prompt and context"""
+        combined = f"{prompt}\x00{context}".lower()
+        return hashlib.blake2b(combined.encode('utf-8'), digest_size=16).digest()
     
     def _get_system_prompt(self) -> str:
         """Get optimized system prompt based on current personality"""
+        # Personalities are fixed, so the prompt only changes when the personality does
+        personality_name = self.personality_system.current_personality
+        system_prompt = self.system_prompt_cache.get(personality_name)
+        if system_prompt is not None:
+            return system_prompt
+        
         personality_info = self.personality_system.get_current_personality_info()
         
         base_prompt = (
@@ -273,7 +434,8 @@ class TerminalAI:
         
         personality_prompt = f"Your personality is {personality_info['name']} - {personality_info['style']}. "
         
-        return base_prompt + personality_prompt
+        system_prompt = self.system_prompt_cache[personality_name] = base_prompt + personality_prompt
+        return system_prompt
     
     def _prepare_full_prompt(self, prompt: str, context: str) -> str:
         """Prepare optimized full prompt"""
@@ -290,38 +452,48 @@ class TerminalAI:
         else:
             return prompt
     
-    def _call_ollama_with_timeout(self, system_prompt: str, full_prompt: str, timeout: int = 30) -> Optional[str]:
-        """Call Ollama with timeout handling"""
+    def _call_ollama_with_timeout(self, system_prompt: str, full_prompt: str, timeout: int = 30,
+                                  cancel_event: Optional[threading.Event] = None) -> Optional[str]:
+        """Call Ollama, streaming the reply and giving up once the deadline passes or the call is cancelled"""
+        deadline = time.monotonic() + timeout
+        stream = None
         try:
-            response = ollama.chat(
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            
+            stream = _OLLAMA_CLIENT.chat(
                 model='llama3.2',
                 messages=[
                     {'role': 'system', 'content': system_prompt},
                     {'role': 'user', 'content': full_prompt}
                 ],
-                stream=False,
-                options={'timeout': timeout}
+                stream=True
             )
             
-            return response['message']['content'].strip()
+            parts = []
+            for chunk in stream:
+                parts.append(chunk['message']['content'])
+                if cancel_event is not None and cancel_event.is_set():
+                    return None  # Closing the stream below frees the model for the winning call
+                if time.monotonic() > deadline:
+                    # Treat a truncated reply as a failure so it never gets cached
+                    print(f"⚠️ Ollama call exceeded {timeout}s, using fallback")
+                    return None
+            
+            return ''.join(parts).strip()
             
         except Exception as e:
             print(f"⚠️ Ollama call failed: {e}")
             return None
+        finally:
+            if stream is not None and hasattr(stream, 'close'):
+                stream.close()  # Stop reading the response if we bailed out early
     
     def _get_fallback_response(self, prompt: str) -> str:
         """Get fallback response when AI is unavailable"""
-        fallback_responses = {
-            "hello": "Hello! How can I help you today?",
-            "hi": "Hi there! What can I do for you?",
-            "how are you": "I'm doing well, thank you! How are you?",
-            "thanks": "You're welcome! Happy to help!",
-            "bye": "Goodbye! Have a great day!"
-        }
-        
         prompt_lower = prompt.lower().strip()
         
-        for key, response in fallback_responses.items():
+        for key, response in _FALLBACK_RESPONSES:
             if key in prompt_lower:
                 return response
         
@@ -329,10 +501,15 @@ class TerminalAI:
     
     def summarize(self, text: str) -> str:
         """Enhanced text summarization"""
-        if len(text) < 100:
-            return text  # No need to summarize short text
+        if len(text) < 200:
+            return text  # Model overhead outweighs summarizing short text
+        
+        # Limit input by words, a closer proxy for tokens than characters
+        words = text.split()
+        if len(words) > 200:
+            text = " ".join(words[:200])
         
-        prompt = f"Summarize this concisely in 2-3 sentences: {text[:1000]}"  # Limit input length
+        prompt = f"Summarize this concisely in 2-3 sentences: {text}"
         return self.get_ai_response(prompt)
     
     def save_to_memory(self, query: str, response: str):
@@ -345,10 +522,6 @@ class TerminalAI:
                 'timestamp': datetime.now().isoformat()
             })
             
-            # Keep memory manageable
-            if len(self.conversation_memory) > 15:
-                self.conversation_memory = self.conversation_memory[-10:]
-                
         except Exception as e:
             if self.debug_mode:
                 print(f"⚠️ Memory save error: {e}")
@@ -375,11 +548,10 @@ class TerminalAI:
             if len(self.conversation_context) == 0:
                 return query
             
-            # Check for pronouns
-            pronouns = {'it', 'that', 'this', 'they', 'them', 'he', 'she', 'his', 'her'}
-            query_words = set(query.lower().split())
+            # Check for pronouns (tokenized so "it," or "that?" still count)
+            query_words = _PRONOUN_TOKEN_RE.findall(query.lower())
             
-            if pronouns.intersection(query_words):
+            if not _PRONOUNS.isdisjoint(query_words):
                 # Get last relevant context
                 recent_context = self.conversation_context[-1] if self.conversation_context else ""
                 if recent_context:
@@ -394,102 +566,118 @@ class TerminalAI:
     
     def load_knowledge(self):
         """Enhanced knowledge loading with error handling"""
+        self.knowledge_logged = 0
         try:
             if os.path.exists(self.knowledge_file):
-                with open(self.knowledge_file, 'r', encoding='utf-8') as f:
-                    self.knowledge = json.load(f)
-                print(f"📚 Loaded {len(self.knowledge)} knowledge items")
+                with open(self.knowledge_file, 'rb') as f:
+                    self.knowledge = _json_loads(f.read())
             else:
                 self.knowledge = {}
-                print("📚 Initialized new knowledge base")
         except Exception as e:
             print(f"⚠️ Knowledge loading error: {e}")
             self.knowledge = {}
+        
+        # Replay updates logged since the last compaction
+        try:
+            with open(self.knowledge_log_file, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        update = _json_loads(line)
+                        self.knowledge[update['key']] = update['entry']
+                        self.knowledge_logged += 1
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Knowledge log replay error: {e}")
+        
+        if self.knowledge:
+            print(f"📚 Loaded {len(self.knowledge)} knowledge items")
+        else:
+            print("📚 Initialized new knowledge base")
+        
+        self.knowledge_log = open(self.knowledge_log_file, 'ab')
+        atexit.register(self.flush_knowledge)
     
     def save_knowledge(self, query: str, answer: str):
         """Enhanced knowledge saving with error handling"""
         try:
             key = query.lower()[:100]  # Limit key length
-            self.knowledge[key] = {
-                'answer': answer,
-                'timestamp': datetime.now().isoformat(),
-                'usage_count': self.knowledge.get(key, {}).get('usage_count', 0) + 1
-            }
-            
-            # Save to file with error handling
-            with open(self.knowledge_file, 'w', encoding='utf-8') as f:
-                json.dump(self.knowledge, f, indent=2, ensure_ascii=False)
+            with self.knowledge_lock:
+                entry = {
+                    'answer': answer,
+                    'timestamp': datetime.now().isoformat(),
+                    'usage_count': self.knowledge.get(key, {}).get('usage_count', 0) + 1
+                }
+                self.knowledge[key] = entry
+                
+                # Append one line instead of rewriting the whole knowledge file
+                self.knowledge_log.write(_json_dumps({'key': key, 'entry': entry}) + b"\n")
+                self.knowledge_log.flush()
+                
+                self.knowledge_logged += 1
+                if self.knowledge_logged >= self.knowledge_compact_interval:
+                    self._compact_knowledge()
                 
         except Exception as e:
             if self.debug_mode:
                 print(f"⚠️ Knowledge save error: {e}")
     
+    def _compact_knowledge(self):
+        """Write the full knowledge file and reset the append-only log (caller holds the lock)"""
+        # Replace the snapshot atomically; the log is only cleared once the new file is in place
+        temp_path = self.knowledge_file + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(_json_dumps(self.knowledge))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.knowledge_file)
+        self.knowledge_log.seek(0)
+        self.knowledge_log.truncate()
+        self.knowledge_logged = 0
+    
+    def flush_knowledge(self):
+        """Compact logged knowledge updates into the knowledge file (called at shutdown)"""
+        try:
+            with self.knowledge_lock:
+                if self.knowledge_logged:
+                    self._compact_knowledge()
+        except Exception as e:
+            print(f"⚠️ Knowledge save error: {e}")
+    
     def needs_search(self, query: str) -> bool:
         """Enhanced intelligent search decision with better accuracy"""
         query_lower = query.lower().strip()
         
         # Immediate skip patterns (high confidence)
-        immediate_skip = [
-            'hello', 'hi', 'hey', 'thanks', 'thank you', 'bye', 'goodbye',
-            'how are you', 'what can you do', 'who are you', 'good morning',
-            'good evening', 'nice', 'great', 'okay', 'yes', 'no', 'sure',
-            'alright', 'fine', 'cool', 'awesome', 'perfect'
-        ]
-        
-        if any(skip in query_lower for skip in immediate_skip):
+        if _SKIP_RE.search(query_lower):
             return False
         
         # Command-based queries (don't search)
-        command_patterns = [
-            'personality', 'memory stats', 'voice test', 'breaking news',
-            'news', 'search live', 'ask me a question', 'quiz me'
-        ]
-        
-        if any(cmd in query_lower for cmd in command_patterns):
+        if _COMMAND_RE.search(query_lower):
             return False
         
         # High-priority search triggers (always search)
-        priority_triggers = [
-            'current', 'latest', 'recent', 'today', 'now', '2024', '2025',
-            'breaking', 'live', 'real-time', 'up-to-date'
-        ]
-        
-        if any(trigger in query_lower for trigger in priority_triggers):
+        if _PRIORITY_RE.search(query_lower):
             return True
         
         # Specific information requests (search)
-        info_requests = [
-            'price of', 'cost of', 'statistics', 'population', 'rate',
-            'weather in', 'temperature', 'forecast', 'news about',
-            'best colleges', 'best hospitals', 'best restaurants',
-            'deaths in', 'mortality', 'crime rate', 'happened in'
-        ]
-        
-        if any(req in query_lower for req in info_requests):
+        if _INFO_REQUEST_RE.search(query_lower):
             return True
         
         # Location-based queries (search)
-        location_indicators = ['near me', 'in my area', 'pincode', 'pin code']
-        if any(loc in query_lower for loc in location_indicators):
+        if _LOCATION_RE.search(query_lower):
             return True
         
         # Basic knowledge (don't search)
-        basic_knowledge = [
-            'what is love', 'what is life', 'what is happiness',
-            'what is water', 'what is fire', 'what is human',
-            'bones in human', 'human bones'
-        ]
-        
-        if any(basic in query_lower for basic in basic_knowledge):
+        if _BASIC_KNOWLEDGE_RE.search(query_lower):
             return False
         
         # Default: search for questions, don't search for statements
-        return '?' in query or query_lower.startswith(('what', 'how', 'when', 'where', 'why', 'who'))
+        return '?' in query or query_lower.startswith(_QUESTION_WORDS)
     
     def extract_pincode_from_query(self, query: str) -> Optional[str]:
         """Extract pincode from query with validation"""
-        import re
-        pincode_match = re.search(r'\b\d{6}\b', query)
+        pincode_match = _PINCODE_RE.search(query)
         if pincode_match:
             pincode = pincode_match.group()
             # Basic validation for Indian pincodes
@@ -518,6 +706,12 @@ class TerminalAI:
         start_time = time.time()
         
         try:
+            # Trivial chatter gets a canned reply without the model or enhancement pipeline
+            quick_reply = self._get_quick_reply(query)
+            if quick_reply:
+                self._update_conversation_context(query, quick_reply)
+                return quick_reply
+            
             # Determine if search is needed
             if self.needs_search(query):
                 return self._handle_search_response(query, start_time)
@@ -528,6 +722,17 @@ class TerminalAI:
             print(f"⚠️ Smart response error: {e}")
             return self._get_fallback_response(query)
     
+    def _get_quick_reply(self, query: str) -> Optional[str]:
+        """Canned reply when the whole query is a bare greeting or thanks, else None"""
+        query_lower = query.lower().strip(" !.,?")
+        if query_lower not in _SKIP_PHRASES:
+            return None
+        
+        for key, response in _FALLBACK_RESPONSES:
+            if key in query_lower:
+                return response
+        return None
+    
     def _handle_search_response(self, query: str, start_time: float) -> str:
         """Handle responses that require web search"""
         print("🔍 Searching for latest information...")
@@ -538,12 +743,25 @@ class TerminalAI:
         if location_info and self.debug_mode:
             print(f"📍 Enhanced query: {enhanced_query}")
         
+        # Start the direct answer speculatively so a slow or failed search costs nothing extra
+        direct_cancel = threading.Event()
+        direct_future = self.executor.submit(self.get_ai_response, self._get_direct_prompt(query),
+                                             cancel_event=direct_cancel)
+        
         # Perform search
-        search_results = self.search_web(enhanced_query)
+        search_future = self.executor.submit(self.search_web, enhanced_query)
+        try:
+            search_results = search_future.result(timeout=self.search_timeout)
+        except FutureTimeoutError:
+            search_results = None
         
         if not search_results or "error" in search_results.lower():
             print("⚠️ Search failed, using AI knowledge")
-            return self._handle_direct_response(query, start_time)
+            return self._handle_direct_response(query, start_time, direct_future)
+        
+        # Search won; stop the direct answer so it doesn't hold up the model
+        direct_cancel.set()
+        direct_future.cancel()
         
         # Prepare context-aware prompt
         enhanced_prompt = self._create_search_prompt(query, location_info)
@@ -565,19 +783,13 @@ class TerminalAI:
         
         return response
     
-    def _handle_direct_response(self, query: str, start_time: float) -> str:
+    def _handle_direct_response(self, query: str, start_time: float, raw_future=None) -> str:
         """Handle responses using AI knowledge without search"""
-        # Get memory context
-        memory_context = self.context_memory.get_relevant_context(query)
-        
-        # Prepare prompt
-        if memory_context and self._should_add_memory_context(query):
-            context_prompt = f"Conversation context: {memory_context}\nCurrent question: {query}"
+        # Get AI response (possibly already started by the search path)
+        if raw_future is not None:
+            raw_response = raw_future.result()
         else:
-            context_prompt = query
-        
-        # Get AI response
-        raw_response = self.get_ai_response(context_prompt)
+            raw_response = self.get_ai_response(self._get_direct_prompt(query))
         
         # Apply enhancements
         response = self.enhance_ai_response(query, raw_response)
@@ -593,6 +805,16 @@ class TerminalAI:
         
         return response
     
+    def _get_direct_prompt(self, query: str) -> str:
+        """Build the prompt for answering from AI knowledge and memory"""
+        # Get memory context
+        memory_context = self.context_memory.get_relevant_context(query)
+        
+        # Prepare prompt
+        if memory_context and self._should_add_memory_context(query):
+            return f"Conversation context: {memory_context}\nCurrent question: {query}"
+        return query
+    
     def _create_search_prompt(self, query: str, location_info: Optional[Dict]) -> str:
         """Create optimized search prompt"""
         base_prompt = (
@@ -621,11 +843,8 @@ class TerminalAI:
     
     def _update_conversation_context(self, query: str, response: str):
         """Update conversation context efficiently"""
+        # Bounded deque keeps context manageable
         self.conversation_context.append(f"Q: {query} A: {response}")
-        
-        # Keep context manageable
-        if len(self.conversation_context) > 20:
-            self.conversation_context = self.conversation_context[-15:]
     
     def enhance_ai_response(self, query: str, raw_response: str) -> str:
         """Enhanced AI response processing with intelligent filtering"""
@@ -664,55 +883,71 @@ class TerminalAI:
     
     def _needs_common_sense_check(self, query: str, response: str) -> bool:
         """Determine if common sense check is needed"""
-        # Safety keywords
-        safety_keywords = ['dangerous', 'harmful', 'illegal', 'unsafe', 'hurt', 'damage']
-        
-        # Logic issue indicators
-        logic_keywords = ['impossible', 'never', 'always', 'can\'t', 'unable']
-        
-        query_lower = query.lower()
-        response_lower = response.lower()
-        
         # Check for safety concerns
-        if any(word in response_lower for word in safety_keywords):
+        if _SAFETY_RE.search(response.lower()):
             return True
         
         # Check for physical impossibilities
-        impossible_queries = ['fly without', 'breathe underwater', 'time travel', 'live forever']
-        if any(impossible in query_lower for impossible in impossible_queries):
+        if _IMPOSSIBLE_RE.search(query.lower()):
             return True
         
         return False
     
     def _should_add_memory_context(self, query: str) -> bool:
         """Determine if memory context should be added"""
-        memory_triggers = [
-            'remember', 'earlier', 'before', 'previous', 'last time',
-            'you said', 'we talked', 'mentioned', 'discussed'
-        ]
-        
-        return any(trigger in query.lower() for trigger in memory_triggers)
+        return _MEMORY_TRIGGER_RE.search(query.lower()) is not None
     
 
     
     def save_enhanced_memory(self, query: str, response: str):
         """Enhanced memory saving with error handling and optimization"""
         try:
-            # Save to memory systems (async for performance)
-            memory_futures = [
-                self.executor.submit(self.save_to_memory, query, response),
-                self.executor.submit(self.save_knowledge, query, response),
-                self.executor.submit(self.context_memory.add_to_session_memory, query, response),
-                self.executor.submit(self.context_memory.add_to_long_term_memory, query, response),
-                self.executor.submit(self.learning_system.learn_from_conversation, query, response)
-            ]
-            
+            # Save to memory systems in one background task (async for performance)
             # Don't wait for completion to avoid blocking
-            # Futures will complete in background
+            self.executor.submit(self._persist_turn, query, response)
             
         except Exception as e:
             print(f"⚠️ Memory save error: {e}")
     
+    def _persist_turn(self, query: str, response: str):
+        """Save one turn to every memory system, in order, on a single worker"""
+        # One timestamp for the whole turn
+        now = datetime.now()
+        
+        steps = (
+            (self.save_to_memory, (query, response)),
+            (self.save_knowledge, (query, response)),
+            (self.context_memory.add_to_session_memory, (query, response, now)),
+            (self.context_memory.add_to_long_term_memory, (query, response, now)),
+            (self.learning_system.learn_from_conversation, (query, response))
+        )
+        
+        # Keep going if one store fails so the others still get the turn
+        for step, args in steps:
+            try:
+                step(*args)
+            except Exception as e:
+                print(f"⚠️ Memory save error: {e}")
+    
+    def start_news_refresh(self):
+        """Keep the headline search warm in a background thread so 'news' answers from cache"""
+        def refresh_loop():
+            while not self.stop_background.is_set():
+                # Pause while the user is away, and leave a tripped engine to recover for their next query
+                idle = time.monotonic() - self.last_input_time > self.news_refresh_idle_limit
+                if idle or not self.web_search.all_engines_available():
+                    self.stop_background.wait(self.news_refresh_interval)
+                    continue
+                try:
+                    # Bypass the cache and re-store a fresh entry, without printing over the prompt
+                    self.news_system.get_latest_news(refresh=True, quiet=True)
+                except Exception as e:
+                    if self.debug_mode:
+                        print(f"⚠️ News refresh error: {e}")
+                self.stop_background.wait(self.news_refresh_interval)
+        
+        threading.Thread(target=refresh_loop, name="AI-NewsRefresh", daemon=True).start()
+    
     def get_system_status(self) -> Dict:
         """Get comprehensive system status"""
         try:
@@ -758,6 +993,10 @@ def main():
         
         print("\n" + "=" * 50)
         
+        # Connect to the search engines and fetch headlines while the user types the first query
+        ai.executor.submit(ai.web_search.warm_pool)
+        ai.start_news_refresh()
+        
         try:
             current_personality = ai.personality_system.get_current_personality_info()
             print(f"🎭 Personality: {current_personality['name']} ({current_personality['style']})")
@@ -771,9 +1010,11 @@ def main():
         while True:
             try:
                 user_input = input("\n> ").strip()
+                ai.last_input_time = time.monotonic()
                 
                 if user_input.lower() == 'quit':
                     print("👋 Goodbye! Thanks for using the AI Assistant!")
+                    ai.stop_background.set()
                     ai.executor.shutdown(wait=False)
                     break
                 
@@ -782,7 +1023,9 @@ def main():
                     print(f"\n📊 System Status:")
                     print(f"Status: {status['status']}")
                     if 'performance' in status:
-                        print(f"Performance: {status['performance']['cache_hit_rate']} cache hit rate")
+                        performance = status['performance']
+                        print(f"Performance: {performance['cache_hit_rate']} cache hit rate, "
+                              f"p50 {performance['p50_response_time']:.2f}s, p95 {performance['p95_response_time']:.2f}s")
                     if 'memory' in status:
                         print(f"Memory: {status['memory']['total_conversations']} conversations")
                 
@@ -800,20 +1043,26 @@ def main():
                     print(f"Learning items: {learning_stats['total_knowledge_items']}")
                 
                 else:
-                    start_time = time.time()
-                    response = ai.smart_response(user_input)
-                    response_time = time.time() - start_time
+                    # Only time the turn when debugging
+                    if ai.debug_mode:
+                        start_time = time.perf_counter()
+                        response = ai.smart_response(user_input)
+                        response_time = time.perf_counter() - start_time
+                    else:
+                        response = ai.smart_response(user_input)
                     
-                    print("\n🤖 AI:")
-                    print(response)
+                    # One buffered write per reply
+                    sys.stdout.write(f"\n🤖 AI:\n{response}\n")
+                    sys.stdout.flush()
                     
                     if ai.debug_mode:
                         print(f"\n🕰️ Response time: {response_time:.2f}s")
                     
-                    ai.speak(response)
+                    ai.speak(response)  # Already runs on the executor; returns at once
             
             except KeyboardInterrupt:
                 print("\n👋 Goodbye! Thanks for using the AI Assistant!")
+                ai.stop_background.set()
                 ai.executor.shutdown(wait=False)
                 break
             except Exception as e:
@@ -1,10 +1,54 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import json
+import os
+import atexit
+import importlib.util
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
 from datetime import datetime
+from typing import NamedTuple
+from urllib.parse import quote_plus
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # Fall back to BeautifulSoup
+    HTMLParser = None
+
+# Faster tree builder for BeautifulSoup when lxml is installed
+_BS4_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+class SearchResult(NamedTuple):
+    """One search hit"""
+    title: str
+    snippet: str
+    url: str
+
+# Only build BeautifulSoup trees for the result blocks, not the whole page
+_DDG_STRAINER = SoupStrainer('div', class_='result')
+_BING_STRAINER = SoupStrainer('li', class_='b_algo')
+
+def canonical_query(query):
+    """Cache key form of a query: lowercased with runs of whitespace collapsed"""
+    return " ".join(query.lower().split())
+
+_SHARED_SEARCH = None
+_SHARED_LOCK = threading.Lock()
+
+def get_shared_search():
+    """Return the process-wide LiveWebSearch so every caller shares one session and cache"""
+    global _SHARED_SEARCH
+    with _SHARED_LOCK:
+        if _SHARED_SEARCH is None:
+            _SHARED_SEARCH = LiveWebSearch()
+        return _SHARED_SEARCH
 
 class LiveWebSearch:
-    def __init__(self):
+    def __init__(self, executor=None):
         self.search_engines = {
             "duckduckgo": "https://duckduckgo.com/html/?q=",
             "bing": "https://www.bing.com/search?q="
@@ -12,96 +56,296 @@ class LiveWebSearch:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        
+        # One pooled session so repeat searches reuse keep-alive connections
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retries = Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # Engines are queried in parallel; a private pool by default so callers
+        # already running on a shared pool never wait on their own workers
+        self.executor = executor or ThreadPoolExecutor(max_workers=4, thread_name_prefix="Search")
+        self.search_timeout = 15  # Overall seconds to wait for any engine
+        self.request_timeout = (3.05, 7)  # (connect, read) seconds per engine request
+        
+        # Circuit breaker: skip an engine for a while after repeated empty/failed searches
+        self.engine_failures = {"duckduckgo": [0, 0.0], "bing": [0, 0.0]}  # name -> [count, last failure]
+        self.failure_threshold = 3
+        self.failure_cooldown = 60  # Seconds
+        self.health_lock = threading.Lock()
+        
+        # Recent formatted results, so repeated news/weather/fact queries skip the network
+        self.result_cache = OrderedDict()  # (query, max_results) -> (text, expiry), LRU order
+        self.cache_ttl = 300  # 5 minutes
+        self.max_cache_size = 256
+        self.cache_lock = threading.Lock()
+        self.cache_file = "web_search_cache.json"  # Unexpired results survive restarts
+        self.load_cache()
+        atexit.register(self.save_cache)
     
-    def search_web(self, query, max_results=5):
-        """Search the web for current information"""
+    def search_web(self, query, max_results=5, refresh=False, quiet=False):
+        """Search the web for current information (refresh skips the cache read; quiet silences errors and the breaker)"""
+        cache_key = (canonical_query(query), max_results)
+        if not refresh:
+            cached = self.get_cached_result(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
-            # Use DuckDuckGo for privacy-friendly search
-            results = self.search_duckduckgo(query, max_results)
-            
-            if not results:
-                # Fallback to Bing if DuckDuckGo fails
-                results = self.search_bing(query, max_results)
+            # Race DuckDuckGo and Bing so a stalled engine doesn't add its latency
+            results = self.search_engines_parallel(query, max_results, quiet)
             
-            return self.format_search_results(results, query)
+            formatted = self.format_search_results(results, query)
+            if results:
+                self.cache_result(cache_key, formatted)
+            return formatted
             
         except Exception as e:
-            print(f"Web search error: {e}")
+            if not quiet:
+                print(f"Web search error: {e}")
             return f"I couldn't search the web right now, but I can help with general information about {query}."
     
-    def search_duckduckgo(self, query, max_results):
+    def warm_pool(self):
+        """Open keep-alive connections to each engine so the first search skips the handshake"""
+        for url in self.search_engines.values():
+            try:
+                self.session.head(url.split('?', 1)[0], timeout=3)
+            except Exception:
+                pass  # Warming is best effort
+    
+    def get_cached_result(self, cache_key):
+        """Return a live cached result and mark it recently used, else None"""
+        with self.cache_lock:
+            entry = self.result_cache.get(cache_key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self.result_cache[cache_key]
+                return None
+            self.result_cache.move_to_end(cache_key)
+            return entry[0]
+    
+    def cache_result(self, cache_key, text):
+        """Cache a formatted result, evicting the least recently used past the size limit"""
+        with self.cache_lock:
+            self.result_cache[cache_key] = (text, time.time() + self.cache_ttl)  # Wall clock, so it can be saved
+            self.result_cache.move_to_end(cache_key)
+            while len(self.result_cache) > self.max_cache_size:
+                self.result_cache.popitem(last=False)
+    
+    def load_cache(self):
+        """Load unexpired search results saved by a previous run"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            
+            # Build aside so a malformed file leaves the cache empty rather than half-loaded
+            loaded = OrderedDict()
+            now = time.time()
+            for query, max_results, text, expiry in entries[-self.max_cache_size:]:
+                if expiry > now:
+                    loaded[(query, max_results)] = (text, expiry)
+            self.result_cache = loaded
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Search cache load error: {e}")
+    
+    def save_cache(self):
+        """Save unexpired search results for the next run (called at shutdown)"""
+        now = time.time()
+        with self.cache_lock:
+            entries = [
+                [query, max_results, text, expiry]
+                for (query, max_results), (text, expiry) in self.result_cache.items()
+                if expiry > now
+            ]
+        
+        try:
+            payload = json.dumps(entries, ensure_ascii=False).encode('utf-8')
+            
+            # One write to a temp file, then rename so readers never see a partial file
+            temp_path = self.cache_file + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.cache_file)
+        except Exception as e:
+            print(f"Search cache save error: {e}")
+    
+    def search_engines_parallel(self, query, max_results, quiet=False):
+        """Query every healthy engine at once and return the first non-empty results"""
+        engines = {"duckduckgo": self.search_duckduckgo, "bing": self.search_bing}
+        healthy = [name for name in engines if self.engine_available(name)]
+        
+        futures = [
+            self.executor.submit(self.run_engine, name, engines[name], query, max_results, quiet)
+            for name in healthy or engines  # Every engine tripped: try them all anyway
+        ]
+        
+        try:
+            for future in as_completed(futures, timeout=self.search_timeout):
+                results = future.result()
+                if results:
+                    return results
+        except FutureTimeoutError:
+            if not quiet:
+                print("Web search timed out")
+        finally:
+            for future in futures:
+                future.cancel()  # No-op for engines already running
+        
+        return []
+    
+    def engine_available(self, name):
+        """False while an engine's breaker is open (too many recent failures)"""
+        with self.health_lock:
+            count, last_failure = self.engine_failures[name]
+            return count < self.failure_threshold or time.monotonic() - last_failure >= self.failure_cooldown
+    
+    def all_engines_available(self):
+        """True when no engine's breaker is open, so background work can't delay a user search"""
+        return all(self.engine_available(name) for name in self.engine_failures)
+    
+    def run_engine(self, name, search, query, max_results, quiet=False):
+        """Run one engine's search and record whether it produced results"""
+        results = search(query, max_results, quiet)
+        if quiet and not results:
+            return results  # Background failures don't count toward the breaker
+        with self.health_lock:
+            if results:
+                self.engine_failures[name] = [0, 0.0]
+            else:
+                self.engine_failures[name][0] += 1
+                self.engine_failures[name][1] = time.monotonic()
+        return results
+    
+    def search_duckduckgo(self, query, max_results, quiet=False):
         """Search using DuckDuckGo"""
         try:
-            url = f"https://duckduckgo.com/html/?q={query}"
-            response = requests.get(url, headers=self.headers, timeout=10)
+            url = self.search_engines["duckduckgo"] + quote_plus(query)
+            response = self.session.get(url, timeout=self.request_timeout)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                results = []
-                
-                # Extract search results
-                for result in soup.find_all('div', class_='result')[:max_results]:
-                    title_elem = result.find('a', class_='result__a')
-                    snippet_elem = result.find('a', class_='result__snippet')
-                    
-                    if title_elem and snippet_elem:
-                        results.append({
-                            'title': title_elem.get_text().strip(),
-                            'snippet': snippet_elem.get_text().strip(),
-                            'url': title_elem.get('href', '')
-                        })
-                
-                return results
+                return self.parse_duckduckgo(response.content, max_results)
             
         except Exception as e:
-            print(f"DuckDuckGo search error: {e}")
+            if not quiet:
+                print(f"DuckDuckGo search error: {e}")
         
         return []
     
-    def search_bing(self, query, max_results):
+    def search_bing(self, query, max_results, quiet=False):
         """Search using Bing (fallback)"""
         try:
             # Simple Bing search implementation
-            url = f"https://www.bing.com/search?q={query}"
-            response = requests.get(url, headers=self.headers, timeout=10)
+            url = self.search_engines["bing"] + quote_plus(query)
+            response = self.session.get(url, timeout=self.request_timeout)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                results = []
-                
-                # Extract Bing results (simplified)
-                for result in soup.find_all('li', class_='b_algo')[:max_results]:
-                    title_elem = result.find('h2')
-                    snippet_elem = result.find('p')
-                    
-                    if title_elem and snippet_elem:
-                        results.append({
-                            'title': title_elem.get_text().strip(),
-                            'snippet': snippet_elem.get_text().strip(),
-                            'url': ''
-                        })
-                
-                return results
+                return self.parse_bing(response.content, max_results)
             
         except Exception as e:
-            print(f"Bing search error: {e}")
+            if not quiet:
+                print(f"Bing search error: {e}")
         
         return []
     
+    def parse_duckduckgo(self, html, max_results):
+        """Extract DuckDuckGo results (selectolax when installed, else BeautifulSoup)"""
+        results = []
+        
+        if HTMLParser:
+            for result in HTMLParser(html).css('div.result')[:max_results]:
+                title_elem = result.css_first('a.result__a')
+                snippet_elem = result.css_first('a.result__snippet')
+                
+                if title_elem and snippet_elem:
+                    results.append(SearchResult(
+                        title_elem.text().strip(),
+                        snippet_elem.text().strip(),
+                        title_elem.attributes.get('href') or ''
+                    ))
+            return results
+        
+        soup = BeautifulSoup(html, _BS4_PARSER, parse_only=_DDG_STRAINER)
+        for result in soup.find_all('div', class_='result')[:max_results]:
+            title_elem = result.find('a', class_='result__a')
+            snippet_elem = result.find('a', class_='result__snippet')
+            
+            if title_elem and snippet_elem:
+                results.append(SearchResult(
+                    title_elem.get_text().strip(),
+                    snippet_elem.get_text().strip(),
+                    title_elem.get('href', '')
+                ))
+        
+        return results
+    
+    def parse_bing(self, html, max_results):
+        """Extract Bing results (selectolax when installed, else BeautifulSoup)"""
+        results = []
+        
+        if HTMLParser:
+            for result in HTMLParser(html).css('li.b_algo')[:max_results]:
+                title_elem = result.css_first('h2')
+                snippet_elem = result.css_first('p')
+                
+                if title_elem and snippet_elem:
+                    results.append(SearchResult(
+                        title_elem.text().strip(),
+                        snippet_elem.text().strip(),
+                        ''
+                    ))
+            return results
+        
+        soup = BeautifulSoup(html, _BS4_PARSER, parse_only=_BING_STRAINER)
+        for result in soup.find_all('li', class_='b_algo')[:max_results]:
+            title_elem = result.find('h2')
+            snippet_elem = result.find('p')
+            
+            if title_elem and snippet_elem:
+                results.append(SearchResult(
+                    title_elem.get_text().strip(),
+                    snippet_elem.get_text().strip(),
+                    ''
+                ))
+        
+        return results
+    
     def format_search_results(self, results, query):
         """Format search results into readable text"""
         if not results:
             return f"I couldn't find current web results for '{query}', but I can provide general information."
         
-        formatted = f"Here's what I found about '{query}':\n\n"
+        parts = [f"Here's what I found about '{query}':\n\n"]
         
         for i, result in enumerate(results, 1):
-            formatted += f"{i}. {result['title']}\n"
-            formatted += f"   {result['snippet']}\n\n"
+            parts.append(f"{i}. {result.title}\n   {result.snippet}\n\n")
         
-        formatted += f"This information was found from live web search on {datetime.now().strftime('%Y-%m-%d %H:%M')}."
+        parts.append(f"This information was found from live web search on {datetime.now().strftime('%Y-%m-%d %H:%M')}.")
         
-        return formatted
+        return ''.join(parts)
+    
+    def batch_search(self, queries, max_results=3):
+        """Run several searches at once and return the formatted results in order"""
+        # A separate pool: each search_web waits on engine tasks in self.executor
+        pool = ThreadPoolExecutor(max_workers=max(1, len(queries)), thread_name_prefix="SearchBatch")
+        try:
+            futures = [pool.submit(self.search_web, query, max_results) for query in queries]
+            results = []
+            for query, future in zip(queries, futures):
+                try:
+                    results.append(future.result(timeout=self.search_timeout))
+                except FutureTimeoutError:
+                    results.append(self.format_search_results([], query))
+            return results
+        finally:
+            pool.shutdown(wait=False)
     
     def get_news(self, topic="latest news"):
         """Get latest news about a topic"""